@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import inspect as sa_inspect, or_
 from typing import List, Optional, Dict, Union, Any
 from pydantic import BaseModel
 from datetime import datetime, timedelta
@@ -98,15 +98,19 @@ def news_to_dict(news: News, db: Session = None) -> dict:
         if source:
             source_name = source.name
 
-    # 获取所属快报信息 - 通过SQL查询
+    # 获取所属快报信息 - 优先使用已预加载的关联，否则通过SQL查询
     digests_info = []
-    if db:
+    digests_loaded = "digests" not in sa_inspect(news).unloaded
+    if digests_loaded or db:
         try:
-            from app.models.digest import Digest
-            # 直接查询包含此新闻的快报
-            digests_query = db.query(Digest).join(
-                Digest.news_items
-            ).filter(News.id == news.id).all()
+            if digests_loaded:
+                digests_query = news.digests
+            else:
+                from app.models.digest import Digest
+                # 直接查询包含此新闻的快报
+                digests_query = db.query(Digest).join(
+                    Digest.news_items
+                ).filter(News.id == news.id).all()
 
             for digest in digests_query:
                 digests_info.append({
@@ -226,7 +230,7 @@ def get_news_list(
 
     # 不进行相似度过滤，直接分页查询
     total = query.count()
-    paginated_items = query.offset(skip).limit(limit).all()
+    paginated_items = query.options(selectinload(News.digests)).offset(skip).limit(limit).all()
 
     # 手动转换ORM对象到字典
     news_dicts = [news_to_dict(news, db) for news in paginated_items]
@@ -362,8 +366,8 @@ def get_recent_news(
     # 计算总数
     total = query.count()
 
-    # 应用分页
-    paginated_items = query.offset(skip).limit(limit).all()
+    # 应用分页，所属快报随本页新闻一次批量加载
+    paginated_items = query.options(selectinload(News.digests)).offset(skip).limit(limit).all()
 
     # 手动转换ORM对象到字典
     news_dicts = [news_to_dict(news, db) for news in paginated_items]
@@ -388,8 +392,6 @@ def get_today_news_count(db: Session = Depends(get_db)):
 @router.get("/{news_id}", response_model=NewsResponse)
 def get_news_detail(news_id: int, db: Session = Depends(get_db)):
     """获取新闻详情"""
-    from sqlalchemy.orm import selectinload
-
     # 预加载关联的快报信息
     db_news = db.query(News).options(selectinload(News.digests)).filter(News.id == news_id).first()
 
@@ -1,19 +1,44 @@
+import atexit
+import copy
+import functools
+import itertools
 import json
 import logging
 import logging.config
 import logging.handlers
 import os
+import queue
 import threading
+import time
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Deque, Dict, List, Optional, Tuple
 
+try:
+    # orjson 为可选依赖，未安装时回退到标准库 json
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
 
-@dataclass
+
+def _dumps_json(payload: Dict[str, Any]) -> str:
+    """序列化日志JSON，优先使用 orjson"""
+    if HAS_ORJSON:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False)
+
+
+@dataclass(slots=True)
 class LogEntry:
-    """结构化日志条目，用于环形缓冲与API输出"""
+    """结构化日志条目，用于环形缓冲与API输出
+
+    使用 __slots__：每条记录都会创建一个实例，环形缓冲中还会长期保留，
+    去掉实例 __dict__ 可减少分配和常驻内存。
+    """
 
     timestamp: datetime
     level: str
@@ -30,7 +55,7 @@ class LogEntry:
 
         # 兼容 log_with_context 中注入的 extra_fields
         extra = getattr(record, "extra_fields", None)
-        if isinstance(extra, dict):
+        if extra and isinstance(extra, dict):
             context.update(extra)
 
         for attr in ("request_id", "task_id", "source_id", "trace_id"):
@@ -98,12 +123,38 @@ class LogEntry:
         )
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """按秒缓存时间字符串的格式化器
+
+    默认 formatTime 每条记录、每个 handler 都要 localtime + strftime 一次；
+    同一秒内的记录共享秒级部分，只需补上毫秒。缓存为类属性，所有实例共用。
+    """
+
+    _last_time = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:  # type: ignore[override]
+        key = (int(record.created), datefmt, self.converter)
+        cached_key, cached = CachedTimeFormatter._last_time
+        if cached_key != key:
+            cached = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            CachedTimeFormatter._last_time = (key, cached)
+        if datefmt:
+            return cached
+        return self.default_msec_format % (cached, record.msecs)
+
+
 class JsonFormatter(logging.Formatter):
     """JSON格式化器，用于结构化日志输出到文件/流"""
 
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
         entry = LogEntry.from_record(record)
-        return json.dumps(entry.to_dict(), ensure_ascii=False)
+        payload = entry.to_dict()
+        # 与标准 Formatter 一致：异常文本缓存到 record.exc_text，多个 handler 复用
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return _dumps_json(payload)
 
 
 class ContextFilter(logging.Filter):
@@ -148,59 +199,18 @@ class BusinessLogFilter(logging.Filter):
     # 任务脚本前缀（允许通过）
     TASK_PREFIXES = ("scripts.cron_jobs.",)
 
-    # 排除的消息模式（正则匹配）
-    EXCLUDE_PATTERNS = [
-        r"中间件收到请求路径",
-        r"INFO:\s+\d+\.\d+\.\d+\.\d+:\d+\s+-\s+\"(GET|POST|PUT|DELETE)",  # Uvicorn访问日志
-        r"Application startup complete",
-        r"Started server process",
-        r"Waiting for application startup",
-    ]
-
-    # 排除的路径（用于过滤健康检查等频繁请求）
-    EXCLUDE_PATHS = {
-        "/health",
-        "/api/logs/statistics",
-        "/api/logs/",
-        "/api/sources/scheduler/status",
-    }
+    # 白名单前缀表：业务模块本身及其子模块、任务脚本，一次 startswith 判断
+    ALLOW_PREFIXES = TASK_PREFIXES + tuple(sorted(BUSINESS_LOGGERS))
 
     def filter(self, record: logging.LogRecord) -> bool:  # type: ignore[override]
-        import re
-
         # 1. 所有ERROR及以上级别的日志都通过
         if record.levelno >= logging.ERROR:
             return True
 
-        # 2. 检查是否是业务关键模块
-        logger_name = record.name
-
-        # 精确匹配业务模块
-        if logger_name in self.BUSINESS_LOGGERS:
-            return True
-
-        # 前缀匹配任务脚本
-        if any(logger_name.startswith(prefix) for prefix in self.TASK_PREFIXES):
-            return True
-
-        # 包含匹配（子模块）
-        for business_logger in self.BUSINESS_LOGGERS:
-            if logger_name.startswith(business_logger):
-                return True
-
-        # 3. 排除特定消息模式
-        message = record.getMessage()
-        for pattern in self.EXCLUDE_PATTERNS:
-            if re.search(pattern, message):
-                return False
-
-        # 4. 排除健康检查等频繁请求
-        for path in self.EXCLUDE_PATHS:
-            if path in message:
-                return False
-
-        # 5. 默认不通过（只允许白名单）
-        return False
+        # 2. 业务关键模块及任务脚本通过；其余一律不通过（只允许白名单），
+        #    中间件、健康检查、Uvicorn 访问日志等噪音都不在白名单内，
+        #    无需再格式化消息逐条匹配排除规则
+        return record.name.startswith(self.ALLOW_PREFIXES)
 
 
 class RingBufferHandler(logging.Handler):
@@ -218,6 +228,87 @@ class RingBufferHandler(logging.Handler):
             self.handleError(record)
 
 
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """带写缓冲的滚动文件处理器
+
+    标准 RotatingFileHandler 每条记录都会 flush 并 seek 检查文件大小，
+    导致每条日志一次 write 系统调用。这里在内存中累计已写入的字节数，
+    每 flush_interval 条或遇到 ERROR 及以上级别时才刷盘。
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        *args: Any,
+        buffer_size: int = 64 * 1024,
+        flush_interval: int = 64,
+        **kwargs: Any,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._size = 0
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):  # type: ignore[override]
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+        # 按字节累计文件大小，记录以流的实际编码计算，中文日志也不会超出 maxBytes
+        self._size = os.path.getsize(self.baseFilename)
+        self._stream_encoding = stream.encoding
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:  # type: ignore[override]
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            size = len(msg.encode(self._stream_encoding, self.errors or "strict"))
+            if self.maxBytes > 0 and self._size + size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += size
+            self._pending += 1
+            if record.levelno >= logging.ERROR or self._pending >= self.flush_interval:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self._pending = 0
+        super().flush()
+
+
+class ExcTextQueueHandler(logging.handlers.QueueHandler):
+    """入队时保留异常文本的 QueueHandler
+
+    标准 prepare 会把格式化后的堆栈并入 msg 并清空 exc_info/exc_text，
+    后台线程里的文件 handler（如 JsonFormatter 的 exception 字段）就看不到异常了。
+    这里只合并消息参数，把异常预先格式化到 exc_text，由各 handler 的格式化器自行输出。
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:  # type: ignore[override]
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            # 堆栈帧不跨线程保留，后续格式化只使用 exc_text
+            record.exc_info = None
+        return record
+
+
 class LogManager:
     """统一的日志缓冲与统计管理器"""
 
@@ -227,6 +318,8 @@ class LogManager:
         self.max_buffer_lines: int = 1000
         self._configured: bool = False
         self._buffer_specs: Dict[str, Tuple[str, int]] = {}
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._logger = logging.getLogger(__name__)
 
     # --------------------------- 初始化/配置 ---------------------------
     def setup_logging(
@@ -238,6 +331,7 @@ class LogManager:
         enable_file: bool = True,
         enable_json: bool = False,
         enable_buffer: bool = True,
+        enable_async_file: bool = True,
         max_bytes: int = 10 * 1024 * 1024,
         backup_count: int = 5,
         buffer_limit: int = 1000,
@@ -263,12 +357,15 @@ class LogManager:
 
         logging.config.dictConfig(config)
 
+        if enable_async_file and (enable_file or enable_json):
+            self._configure_async_file_handlers()
+
         if enable_buffer:
             self._configure_buffers()
 
         self._configured = True
 
-        logging.getLogger(__name__).info(
+        self._logger.info(
             "日志系统初始化完成",
             extra={
                 "extra_fields": {
@@ -278,6 +375,7 @@ class LogManager:
                     "file": enable_file,
                     "json": enable_json,
                     "buffer": enable_buffer,
+                    "async_file": self._listener is not None,
                 }
             },
         )
@@ -298,10 +396,12 @@ class LogManager:
 
         formatters: Dict[str, Any] = {
             "console": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                "()": CachedTimeFormatter,
+                "fmt": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             },
             "detailed": {
-                "format": (
+                "()": CachedTimeFormatter,
+                "fmt": (
                     "%(asctime)s - %(name)s - %(levelname)s - "
                     "%(module)s:%(funcName)s:%(lineno)d - %(message)s"
                 ),
@@ -328,7 +428,7 @@ class LogManager:
             handlers.update(
                 {
                     "file_main": {
-                        "class": "logging.handlers.RotatingFileHandler",
+                        "()": BufferedRotatingFileHandler,
                         "level": "DEBUG",
                         "formatter": "detailed",
                         "filename": str(log_dir / "daily_digest.log"),
@@ -348,7 +448,7 @@ class LogManager:
                         "filters": ["context"],
                     },
                     "file_crawler": {
-                        "class": "logging.handlers.RotatingFileHandler",
+                        "()": BufferedRotatingFileHandler,
                         "level": "DEBUG",
                         "formatter": "detailed",
                         "filename": str(log_dir / "crawler.log"),
@@ -357,7 +457,7 @@ class LogManager:
                         "encoding": "utf-8",
                     },
                     "file_llm": {
-                        "class": "logging.handlers.RotatingFileHandler",
+                        "()": BufferedRotatingFileHandler,
                         "level": "DEBUG",
                         "formatter": "detailed",
                         "filename": str(log_dir / "llm_processor.log"),
@@ -370,7 +470,7 @@ class LogManager:
 
         if enable_json:
             handlers["file_json"] = {
-                "class": "logging.handlers.RotatingFileHandler",
+                "()": BufferedRotatingFileHandler,
                 "level": "INFO",
                 "formatter": "json",
                 "filename": str(log_dir / "daily_digest.json.log"),
@@ -417,6 +517,57 @@ class LogManager:
             },
         }
 
+    def _configure_async_file_handlers(self) -> None:
+        """将文件 handler 移到 QueueListener 后台线程，业务线程只做入队"""
+
+        root_logger = logging.getLogger()
+        file_handlers: List[logging.Handler] = []
+
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, logging.handlers.RotatingFileHandler):
+                root_logger.removeHandler(handler)
+                file_handlers.append(handler)
+
+        # 模块专属文件改由根 logger 统一入队，用名称过滤器保持原有分流
+        for logger_name in ("app.services.crawler", "app.services.llm_processor"):
+            target_logger = logging.getLogger(logger_name)
+            for handler in list(target_logger.handlers):
+                if isinstance(handler, logging.handlers.RotatingFileHandler):
+                    target_logger.removeHandler(handler)
+                    handler.addFilter(logging.Filter(logger_name))
+                    file_handlers.append(handler)
+
+        if not file_handlers:
+            return
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        root_logger.addHandler(ExcTextQueueHandler(log_queue))
+
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *file_handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.shutdown)
+
+    def flush_file_handlers(self) -> None:
+        """刷新带缓冲的文件 handler，确保读取日志文件时内容完整"""
+        if self._listener is not None:
+            handlers = list(self._listener.handlers)
+        else:
+            handlers = list(logging.getLogger().handlers)
+            for logger_name in ("app.services.crawler", "app.services.llm_processor"):
+                handlers.extend(logging.getLogger(logger_name).handlers)
+
+        for handler in handlers:
+            if isinstance(handler, BufferedRotatingFileHandler):
+                handler.flush()
+
+    def shutdown(self) -> None:
+        """停止后台写文件线程，并把队列中剩余的日志刷到磁盘"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
     def _configure_buffers(self) -> None:
         """创建环形缓冲并挂载 handler"""
 
@@ -442,7 +593,7 @@ class LogManager:
             self.buffer_locks[name] = threading.Lock()
 
             handler = RingBufferHandler(self, name, level)
-            formatter = logging.Formatter(
+            formatter = CachedTimeFormatter(
                 "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
             )
             handler.setFormatter(formatter)
@@ -478,11 +629,15 @@ class LogManager:
         with self.buffer_locks[buffer_name]:
             self.buffers[buffer_name].append(entry)
 
-    def _get_entries(self, buffer_name: str) -> List[LogEntry]:
+    def _get_entries(self, buffer_name: str, max_lines: Optional[int] = None) -> List[LogEntry]:
         if buffer_name not in self.buffers:
             return []
         with self.buffer_locks[buffer_name]:
-            return list(self.buffers[buffer_name])
+            buffer = self.buffers[buffer_name]
+            if max_lines and max_lines < len(buffer):
+                # 只复制尾部，避免整体拷贝后再切片
+                return list(itertools.islice(buffer, len(buffer) - max_lines, None))
+            return list(buffer)
 
     def get_recent_logs(
         self, buffer_name: str = "general", max_lines: Optional[int] = None, structured: bool = False
@@ -490,9 +645,7 @@ class LogManager:
         if buffer_name not in self.buffers:
             return [] if structured else [f"缓冲区 '{buffer_name}' 不存在"]
 
-        entries = self._get_entries(buffer_name)
-        if max_lines:
-            entries = entries[-max_lines:]
+        entries = self._get_entries(buffer_name, max_lines)
 
         if not entries:
             return [] if structured else ["尚无日志记录"]
@@ -508,7 +661,7 @@ class LogManager:
         with self.buffer_locks[buffer_name]:
             self.buffers[buffer_name].clear()
 
-        logging.getLogger(__name__).info(f"日志缓冲区 '{buffer_name}' 已清空")
+        self._logger.info(f"日志缓冲区 '{buffer_name}' 已清空")
         return {"status": "success", "message": f"日志缓冲区 '{buffer_name}' 已清空"}
 
     def get_buffer_list(self) -> List[str]:
@@ -665,6 +818,8 @@ class LogManager:
         if not log_path.exists():
             return [f"日志文件 {log_file} 不存在"]
 
+        self.flush_file_handlers()
+
         with log_path.open("r", encoding="utf-8") as fh:
             lines = fh.readlines()
 
@@ -706,14 +861,20 @@ def log_function_call(logger: Optional[logging.Logger] = None):
     """函数调用日志装饰器"""
 
     def decorator(func):
+        # 在装饰时解析一次目标logger，避免每次调用都查找
+        target_logger = logger or logging.getLogger(func.__module__)
+        trace_context = {"function": func.__name__}
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            target_logger = logger or logging.getLogger(func.__module__)
-            trace_context = {"function": func.__name__}
-            log_with_context(target_logger, logging.INFO, "调用函数", **trace_context)
+            # INFO 未启用时跳过 LogRecord 构造
+            if target_logger.isEnabledFor(logging.INFO):
+                log_with_context(target_logger, logging.INFO, "调用函数", **trace_context)
 
             try:
                 result = func(*args, **kwargs)
-                log_with_context(target_logger, logging.INFO, "函数执行成功", **trace_context)
+                if target_logger.isEnabledFor(logging.INFO):
+                    log_with_context(target_logger, logging.INFO, "函数执行成功", **trace_context)
                 return result
             except Exception as exc:
                 log_with_context(
@@ -45,7 +45,8 @@ def get_pdf_absolute_path(relative_path: str) -> Path:
     Returns:
         绝对路径Path对象
     """
-    if Path(relative_path).is_absolute():
+    # os.path.isabs 只做字符串判断，避免为判断绝对路径额外构造一次 Path
+    if os.path.isabs(relative_path):
         return Path(relative_path)
     
     # 处理以static/开头的相对路径
@@ -1,15 +1,35 @@
 """
 爬虫模块
 包含所有网站爬虫和文章解析器
+
+导出对象按需导入（PEP 562），避免仅引用本包时就加载 Playwright、BeautifulSoup 等重量级依赖
 """
 
-from .wechat.playwright_wechat_crawler import WechatArticleCrawler
-from .wechat.wechat_article_processor import ArticleParserRegistry, process_url
-from .parsers.security_digest_parser import SecurityDigestParser
+_LAZY_EXPORTS = {
+    'WechatArticleCrawler': '.wechat.playwright_wechat_crawler',
+    'ArticleParserRegistry': '.wechat.wechat_article_processor',
+    'process_url': '.wechat.wechat_article_processor',
+    'SecurityDigestParser': '.parsers.security_digest_parser',
+}
 
 __all__ = [
     'WechatArticleCrawler',
     'ArticleParserRegistry', 
     'process_url',
     'SecurityDigestParser'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,17 +1,40 @@
 import asyncio
+import atexit
+import importlib.util
+import json
 import re
-from typing import Optional, Dict
+from typing import TYPE_CHECKING, Optional, Dict, Iterable
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+if TYPE_CHECKING:  # pragma: no cover
+    from bs4 import BeautifulSoup
+    from bs4.element import Tag
+
+# Playwright 是可选的，若环境未安装浏览器，也能仅用 requests 退化运行。
+# 这里只探测是否安装，真正的导入推迟到首次需要浏览器时，避免拖慢冷启动；
+# BeautifulSoup 同理，只在没有 selectolax 时才在解析函数内导入。
 try:
-    # Playwright 是可选的，若环境未安装浏览器，也能仅用 requests 退化运行
-    from playwright.async_api import async_playwright  # type: ignore
-    HAS_PLAYWRIGHT = True
+    HAS_PLAYWRIGHT = importlib.util.find_spec("playwright") is not None
 except Exception:  # pragma: no cover
     HAS_PLAYWRIGHT = False
 
+try:
+    # orjson 为可选依赖，未安装时回退到标准库 json
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+try:
+    # selectolax 是可选的 C 解析器，未安装时回退到 BeautifulSoup
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+    HAS_SELECTOLAX = True
+except Exception:  # pragma: no cover
+    HAS_SELECTOLAX = False
+
 
 # 基础浏览器头，尽量贴近真实浏览器
 BROWSER_HEADERS = {
@@ -24,106 +47,303 @@ BROWSER_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7",
 }
 
+# Cloudflare 拦截页特征，合并为一个正则一次扫描
+_CLOUDFLARE_RE = re.compile(
+    r"Just a moment\."
+    r"|Checking your browser before accessing"
+    r"|Attention Required! \| Cloudflare"
+    r"|Please enable JavaScript and cookies to continue",
+    re.I,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 模块级共享 Session，复用同一主机的 TCP/TLS 连接
+_SESSION = requests.Session()
+_SESSION.headers.update(BROWSER_HEADERS)
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+atexit.register(_SESSION.close)
+
+# 噪声标签与结构性噪声选择器
+_NOISE_TAGS = ["script", "style", "noscript", "template"]
+_NOISE_SELECTORS = [
+    "header",
+    "footer",
+    "nav",
+    "aside",
+    ".sidebar",
+    ".ads, .advert, .advertisement",
+    "#sidebar",
+    "#comments",
+]
+
+# 正文容器候选选择器，按优先级排列
+_MAIN_CONTAINER_SELECTORS = [
+    "article",
+    "main",
+    "#content",
+    ".content",
+    ".article",
+    ".post",
+    ".post-content",
+    ".entry-content",
+    ".rich_media_content",  # 微信
+    "#js_content",  # 微信
+]
+
+# JSON-LD 中视为文章正文的 @type
+_JSONLD_ARTICLE_TYPES = {"NewsArticle", "Article", "BlogPosting"}
+_JSONLD_SELECTOR = 'script[type="application/ld+json"]'
+_OG_DESCRIPTION_SELECTOR = 'meta[property="og:description"], meta[name="description"]'
+
+
+# 流式抓取时首块大小及正文上限（字节）；超过上限的页面交给 Playwright 抓取
+_STREAM_HEAD_BYTES = 64 * 1024
+_MAX_HTML_BYTES = 2_000_000
+
 
 def _is_cloudflare_interstitial(text: str) -> bool:
     if not text:
         return False
-    patterns = [
-        r"Just a moment\.",
-        r"Checking your browser before accessing",
-        r"Attention Required! \| Cloudflare",
-        r"Please enable JavaScript and cookies to continue",
-    ]
-    for p in patterns:
-        if re.search(p, text, flags=re.I):
-            return True
-    return False
-
-
-def _strip_noise_tags(soup: BeautifulSoup) -> None:
-    for tag in soup(["script", "style", "noscript", "template"]):
-        tag.decompose()
-    # 结构性噪声
-    for sel in [
-        "header",
-        "footer",
-        "nav",
-        "aside",
-        ".sidebar",
-        ".ads, .advert, .advertisement",
-        "#sidebar",
-        "#comments",
-    ]:
-        for node in soup.select(sel):
-            try:
-                node.decompose()
-            except Exception:
-                pass
+    return _CLOUDFLARE_RE.search(text) is not None
+
+
+def _selector_key(selector: str):
+    """把简单选择器（tag / #id / .class）拆成 (类别, 值)"""
+    if selector.startswith("#"):
+        return ("id", selector[1:])
+    if selector.startswith("."):
+        return ("class", selector[1:])
+    return ("name", selector)
+
+
+# BeautifulSoup 单次遍历使用的匹配表，与 _NOISE_TAGS/_NOISE_SELECTORS、
+# _MAIN_CONTAINER_SELECTORS 描述的是同一组规则
+_NOISE_NAMES = frozenset(_NOISE_TAGS) | {"header", "footer", "nav", "aside"}
+_NOISE_CLASSES = frozenset({"sidebar", "ads", "advert", "advertisement"})
+_NOISE_IDS = frozenset({"sidebar", "comments"})
+_MAIN_CONTAINER_KEYS = [_selector_key(sel) for sel in _MAIN_CONTAINER_SELECTORS]
+_FALLBACK_CONTAINER_NAMES = frozenset({"div", "section", "article"})
+
+
+def _is_noise(tag: "Tag") -> bool:
+    if tag.name in _NOISE_NAMES:
+        return True
+    if tag.get("id") in _NOISE_IDS:
+        return True
+    classes = tag.get("class")
+    return bool(classes) and not _NOISE_CLASSES.isdisjoint(classes)
+
+
+def _tag_keys(tag: "Tag"):
+    yield ("name", tag.name)
+    tag_id = tag.get("id")
+    if tag_id:
+        yield ("id", tag_id)
+    for cls in tag.get("class") or ():
+        yield ("class", cls)
+
+
+def _single_pass_extract(soup: "BeautifulSoup"):
+    """一次遍历完成去噪、正文容器选择和标题提取
+
+    先序遍历时跳过噪声子树（遍历结束后统一 decompose），同时记录每个容器
+    选择器的首个命中节点、候选 div/section/article、首个 h1 和 title；
+    先序序列倒序后每个节点都排在其全部后代之后，可一次累加出各节点
+    get_text(strip=True) 的长度。
+
+    Returns:
+        (正文容器, 标题)
+    """
+    from bs4.element import CData, NavigableString, Tag
+
+    order = []
+    to_decompose = []
+    first_match: Dict[tuple, "Tag"] = {}
+    candidates = []
+    h1 = None
+    title_tag = None
+
+    stack = [soup]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Tag):
+            if node is not soup:
+                if _is_noise(node):
+                    to_decompose.append(node)
+                    continue
+                for key in _tag_keys(node):
+                    first_match.setdefault(key, node)
+                if node.name in _FALLBACK_CONTAINER_NAMES:
+                    candidates.append(node)
+                elif node.name == "h1" and h1 is None:
+                    h1 = node
+                elif node.name == "title" and title_tag is None:
+                    title_tag = node
+            stack.extend(reversed(node.contents))
+        order.append(node)
+
+    lengths: Dict[int, int] = {}
+    for node in reversed(order):
+        parent = node.parent
+        if isinstance(node, Tag):
+            length = lengths.setdefault(id(node), 0)
+        elif type(node) in (NavigableString, CData):
+            length = len(node.strip())
+        else:
+            continue
+        if parent is not None and length:
+            lengths[id(parent)] = lengths.get(id(parent), 0) + length
+
+    for node in to_decompose:
+        node.decompose()
+
+    container = None
+    for key in _MAIN_CONTAINER_KEYS:
+        node = first_match.get(key)
+        if node is not None and lengths.get(id(node), 0) > 200:
+            container = node
+            break
+    if container is None:
+        # 回退：选择文本最多的 div
+        container = soup.body or soup
+        max_len = 0
+        for div in candidates:
+            text_len = lengths.get(id(div), 0)
+            if text_len > max_len:
+                max_len = text_len
+                container = div
 
+    title = ""
+    if h1 is not None:
+        title = h1.get_text(strip=True)
+    if not title and title_tag is not None:
+        title = title_tag.get_text(strip=True)
+    return container, title
 
-def _choose_main_container(soup: BeautifulSoup) -> BeautifulSoup:
-    candidates = [
-        "article",
-        "main",
-        "#content",
-        ".content",
-        ".article",
-        ".post",
-        ".post-content",
-        ".entry-content",
-        ".rich_media_content",  # 微信
-        "#js_content",  # 微信
-    ]
-    for sel in candidates:
-        node = soup.select_one(sel)
-        if node and len(node.get_text(strip=True)) > 200:
-            return node
-    # 回退：选择文本最多的 div
-    best_node = soup.body or soup
-    max_len = 0
-    for div in soup.find_all(["div", "section", "article"]):
-        text_len = len(div.get_text(strip=True))
-        if text_len > max_len:
-            max_len = text_len
-            best_node = div
-    return best_node
-
-
-def _extract_title(soup: BeautifulSoup) -> str:
-    h1 = soup.find("h1")
-    if h1 and h1.get_text(strip=True):
-        return h1.get_text(strip=True)
-    if soup.title and soup.title.get_text(strip=True):
-        return soup.title.get_text(strip=True)
-    return ""
+
+def _loads_json(text: str):
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _extract_from_jsonld(scripts: Iterable[str]) -> Optional[Dict[str, str]]:
+    """从 JSON-LD 脚本中提取文章标题和正文
+
+    许多 SPA 页面会把完整正文放在 NewsArticle/Article 的 articleBody 中，
+    命中时即可跳过 DOM 启发式和浏览器渲染。
+    """
+    for raw in scripts:
+        if not raw or not raw.strip():
+            continue
+        try:
+            data = _loads_json(raw)
+        except Exception:
+            continue
+        stack = [data]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, list):
+                stack.extend(obj)
+                continue
+            if not isinstance(obj, dict):
+                continue
+            if "@graph" in obj:
+                stack.append(obj["@graph"])
+            obj_type = obj.get("@type")
+            types = obj_type if isinstance(obj_type, list) else [obj_type]
+            if not any(isinstance(t, str) and t in _JSONLD_ARTICLE_TYPES for t in types):
+                continue
+            body = obj.get("articleBody")
+            if isinstance(body, str):
+                body = _clean_text(body)
+                if len(body) >= 200:
+                    headline = obj.get("headline")
+                    return {
+                        "title": headline.strip() if isinstance(headline, str) else "",
+                        "content": body,
+                    }
+    return None
+
+
+def _apply_description_fallback(parsed: Dict[str, str], description: Optional[str]) -> Dict[str, str]:
+    """正文过短时，以 og:description 作为最后的预览内容"""
+    description = _clean_text(description or "")
+    if len(parsed["content"]) < 200 and len(description) > len(parsed["content"]):
+        parsed["content"] = description
+    return parsed
 
 
 def _clean_text(text: str) -> str:
     if not text:
         return ""
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
     return text.strip()
 
 
+def _fast_text(node) -> str:
+    """拼接节点下的全部文本后一次性折叠空白
+
+    等价于 get_text(separator=" ", strip=True) 再 _clean_text，
+    但省去逐个文本节点的 strip 和中间列表。
+    """
+    return _WHITESPACE_RE.sub(" ", " ".join(node.strings)).strip()
+
+
 def _requests_fetch_html(url: str, timeout: int = 20) -> Optional[str]:
     try:
-        with requests.Session() as s:
-            s.headers.update(BROWSER_HEADERS)
-            resp = s.get(url, timeout=timeout)
+        # 流式读取：先用首块判断是否为 Cloudflare 拦截页，命中则不再下载剩余内容
+        with _SESSION.get(url, timeout=timeout, stream=True) as resp:
             if resp.status_code >= 400:
                 return None
-            text = resp.text or ""
-            if _is_cloudflare_interstitial(text):
+            content_length = resp.headers.get("Content-Length", "")
+            if content_length.isdigit() and int(content_length) > _MAX_HTML_BYTES:
+                return None
+            chunks = resp.iter_content(_STREAM_HEAD_BYTES)
+            head = next(chunks, b"")
+            if _is_cloudflare_interstitial(
+                head.decode(resp.encoding or "utf-8", errors="ignore")
+            ):
                 return None
-            return text
+
+            parts = [head]
+            size = len(head)
+            for chunk in chunks:
+                parts.append(chunk)
+                size += len(chunk)
+                if size > _MAX_HTML_BYTES:
+                    # 不返回截断的页面，交给 Playwright 回退抓取
+                    return None
+            body = b"".join(parts)
+
+            # 与 resp.text 一致：响应头未声明编码时按内容探测
+            encoding = resp.encoding
+            if not encoding and requests.compat.chardet is not None:
+                encoding = requests.compat.chardet.detect(body)["encoding"]
+            return body.decode(encoding or "utf-8", errors="replace")
     except Exception:
         return None
 
 
+async def _async_fetch_html(url: str, timeout: int = 20) -> Optional[str]:
+    """在线程池中执行 requests 抓取，避免阻塞事件循环
+
+    调用方可能每篇文章都通过 asyncio.run 新建事件循环，
+    绑定单一循环的异步客户端无法跨循环复用，因此沿用模块级的同步连接池。
+    """
+    return await asyncio.to_thread(_requests_fetch_html, url, timeout)
+
+
 async def _playwright_fetch_html(url: str, timeout_ms: int = 30000) -> Optional[str]:
     if not HAS_PLAYWRIGHT:
         return None
     try:
+        from playwright.async_api import async_playwright  # type: ignore
+
+        # 调用方以 asyncio.run 逐篇执行，Playwright 连接无法跨事件循环复用，
+        # 每次调用独立启动浏览器，退出 async with 时随 Playwright 一并关闭
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             context = await browser.new_context(user_agent=BROWSER_HEADERS["User-Agent"])  # type: ignore
@@ -137,21 +357,73 @@ async def _playwright_fetch_html(url: str, timeout_ms: int = 30000) -> Optional[
             html = await page.content()
             await context.close()
             await browser.close()
-            if _is_cloudflare_interstitial(html):
-                return None
-            return html
+        if _is_cloudflare_interstitial(html):
+            return None
+        return html
     except Exception:
         return None
 
 
+def _parse_html_to_text_fast(html: str) -> Dict[str, str]:
+    """selectolax 版本的正文提取，逻辑与 BeautifulSoup 版本一致"""
+    tree = LexborHTMLParser(html)
+    jsonld = _extract_from_jsonld(node.text(deep=True) for node in tree.css(_JSONLD_SELECTOR))
+    meta = tree.css_first(_OG_DESCRIPTION_SELECTOR)
+    description = meta.attributes.get("content") if meta is not None else None
+
+    for sel in _NOISE_TAGS + _NOISE_SELECTORS:
+        for node in tree.css(sel):
+            node.decompose()
+
+    container = None
+    for sel in _MAIN_CONTAINER_SELECTORS:
+        node = tree.css_first(sel)
+        if node is not None and len(node.text(strip=True)) > 200:
+            container = node
+            break
+
+    if container is None:
+        # 回退：选择文本最多的 div
+        container = tree.body or tree.root
+        max_len = 0
+        for div in tree.css("div, section, article"):
+            text_len = len(div.text(strip=True))
+            if text_len > max_len:
+                max_len = text_len
+                container = div
+
+    title = ""
+    for sel in ("h1", "title"):
+        node = tree.css_first(sel)
+        if node is not None:
+            title = node.text(strip=True)
+            if title:
+                break
+
+    if jsonld is not None:
+        return {"title": jsonld["title"] or title, "content": jsonld["content"]}
+
+    text = container.text(separator=" ", strip=True) if container is not None else ""
+    return _apply_description_fallback({"title": title, "content": _clean_text(text)}, description)
+
+
 def _parse_html_to_text(html: str) -> Dict[str, str]:
+    if HAS_SELECTOLAX:
+        return _parse_html_to_text_fast(html)
+
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "lxml")
-    _strip_noise_tags(soup)
-    container = _choose_main_container(soup)
-    title = _extract_title(soup)
-    text = container.get_text(separator=" ", strip=True)
-    text = _clean_text(text)
-    return {"title": title, "content": text}
+    jsonld = _extract_from_jsonld(str(node.string or "") for node in soup.select(_JSONLD_SELECTOR))
+    meta = soup.select_one(_OG_DESCRIPTION_SELECTOR)
+    description = meta.get("content") if meta is not None else None
+
+    container, title = _single_pass_extract(soup)
+    if jsonld is not None:
+        return {"title": jsonld["title"] or title, "content": jsonld["content"]}
+
+    text = _fast_text(container)
+    return _apply_description_fallback({"title": title, "content": text}, description)
 
 
 async def crawl_article_content(url: str, timeout_ms: int = 30000) -> Optional[Dict[str, str]]:
@@ -160,10 +432,10 @@ async def crawl_article_content(url: str, timeout_ms: int = 30000) -> Optional[D
 
     Returns: {"title": str, "content": str, "url": str, "success": bool}
     """
-    # 1) requests 优先
-    html = _requests_fetch_html(url)
+    # 1) requests 优先（在线程中执行，不阻塞事件循环）
+    html = await _async_fetch_html(url)
     if html:
-        parsed = _parse_html_to_text(html)
+        parsed = await asyncio.to_thread(_parse_html_to_text, html)
         if len(parsed.get("content", "")) >= 200:
             return {
                 "title": parsed.get("title", ""),
@@ -175,7 +447,7 @@ async def crawl_article_content(url: str, timeout_ms: int = 30000) -> Optional[D
     # 2) 回退 Playwright（如可用）
     html = await _playwright_fetch_html(url, timeout_ms=timeout_ms)
     if html:
-        parsed = _parse_html_to_text(html)
+        parsed = await asyncio.to_thread(_parse_html_to_text, html)
         if len(parsed.get("content", "")) >= 200:
             return {
                 "title": parsed.get("title", ""),
@@ -11,6 +11,10 @@ from typing import Dict, Any, Type, List
 class BaseArticleParser:
     """文章解析器基类"""
 
+    # 解析器按文章逐个创建，使用 __slots__ 省去实例 __dict__；
+    # 子类需同样声明自己的 __slots__
+    __slots__ = ("raw_content",)
+
     def __init__(self, content: str):
         """初始化解析器
 
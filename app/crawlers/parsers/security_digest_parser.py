@@ -1,14 +1,43 @@
 import re
 from datetime import datetime
-from typing import Dict, Any, Optional
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 
 from . import BaseArticleParser
 
+try:
+    # selectolax 是可选的 C 解析器，未安装时回退到 BeautifulSoup
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+    HAS_SELECTOLAX = True
+except Exception:  # pragma: no cover
+    HAS_SELECTOLAX = False
+
+_TITLE_RE = re.compile(r"(.*?)【(\d+)】(\d+)期")
+_AUTHOR_RE = re.compile(r"作者:\s?(.*?)\n")
+_TIME_RE = re.compile(r"发布时间:\s?(.*?)\n")
+# <p> 中的 "数字.标题"（数字和点号之间可能没有空格）
+_P_ITEM_RE = re.compile(r"^(\d+)\.(.+)$")
+# 纯文本中逐行的 "编号.标题" 或 "编号. 标题"，一次 finditer 扫完全文；
+# [^\S\n] 为不跨行的空白，相当于先对每行 strip 再匹配
+_LINE_ITEM_RE = re.compile(r"^[^\S\n]*(\d+)\.[^\S\n]*([^\n]*?)[^\S\n]*$", re.M)
+
 
 class SecurityDigestParser(BaseArticleParser):
     """5th域安全微讯早报解析器
     """
 
+    __slots__ = (
+        "metadata",
+        "title",
+        "digest_date",
+        "issue_number",
+        "author",
+        "publish_time",
+        "news_items",
+        "categories",
+        "simple_mode",
+    )
+
     def __init__(self, content: str, metadata: Optional[Dict[str, str]] = None):
         """初始化解析器
 
@@ -53,10 +82,10 @@ class SecurityDigestParser(BaseArticleParser):
             self._parse_basic_info()
         
         # 提取所有编号的新闻标题
-        title_dict = self._extract_title_list_from_html()
+        title_list = self._extract_title_list_from_html()
         
-        # 转换为news_items格式
-        for news_id, title in sorted(title_dict.items()):
+        # 转换为news_items格式（已按编号排序并去重）
+        for news_id, title in title_list:
             self.news_items.append({
                 "id": news_id,
                 "title": title,
@@ -71,71 +100,78 @@ class SecurityDigestParser(BaseArticleParser):
     def _parse_basic_info(self):
         """解析快报的基本信息：标题、日期、期号等"""
         # 提取快报标题
-        title_match = re.search(r"(.*?)【(\d+)】(\d+)期", self.raw_content)
+        title_match = _TITLE_RE.search(self.raw_content)
         if title_match:
             self.title = title_match.group(1).strip()
             self.digest_date = title_match.group(2)
             self.issue_number = title_match.group(3)
 
         # 提取作者和发布时间
-        author_match = re.search(r"作者:\s?(.*?)\n", self.raw_content)
+        author_match = _AUTHOR_RE.search(self.raw_content)
         if author_match:
             self.author = author_match.group(1).strip()
 
-        time_match = re.search(r"发布时间:\s?(.*?)\n", self.raw_content)
+        time_match = _TIME_RE.search(self.raw_content)
         if time_match:
             self.publish_time = time_match.group(1).strip()
 
-    def _extract_title_list_from_html(self) -> Dict[int, str]:
+    def _extract_title_list_from_html(self) -> List[Tuple[int, str]]:
         """从HTML内容中提取新闻标题列表（用于RSS HTML）
         
         RSS HTML格式：每条新闻在独立的 <p> 标签中，格式为 "数字.标题"
         
         Returns:
-            Dict[int, str]: 编号到标题的映射
+            List[Tuple[int, str]]: 按编号排序且编号唯一的 (编号, 标题) 列表
         """
-        from bs4 import BeautifulSoup
-        
-        title_dict = {}
+        title_list = []
         
         try:
-            soup = BeautifulSoup(self.raw_content, 'html.parser')
+            if HAS_SELECTOLAX:
+                tree = LexborHTMLParser(self.raw_content)
+                paragraph_texts = [p.text(strip=True) for p in tree.css('p')]
+                if tree.root is not None:
+                    get_full_text = tree.root.text
+                else:
+                    get_full_text = lambda: ""
+            else:
+                from bs4 import BeautifulSoup
+
+                soup = BeautifulSoup(self.raw_content, 'html.parser')
+                paragraph_texts = [p.get_text(strip=True) for p in soup.find_all('p')]
+                get_full_text = soup.get_text
             
             # 方法1: 从 <p> 标签中提取
-            for p in soup.find_all('p'):
-                text = p.get_text(strip=True)
+            for text in paragraph_texts:
+                # 大部分段落不是编号条目，首字符不是数字时直接跳过正则匹配
+                if not text or not text[0].isdigit():
+                    continue
                 # 匹配 "数字.标题" 格式（数字和点号之间可能没有空格）
-                match = re.match(r'^(\d+)\.(.+)$', text)
+                match = _P_ITEM_RE.match(text)
                 if match:
                     news_id = int(match.group(1))
                     title = match.group(2).strip()
                     # 过滤一些无效标题
                     if title and len(title) > 3 and title not in ['备注:', '个性化专题资讯信息，欢迎订阅！']:
-                        title_dict[news_id] = title
+                        title_list.append((news_id, title))
             
             # 如果方法1没找到，尝试方法2：从纯文本中提取
-            if not title_dict:
-                text_content = soup.get_text()
-                lines = text_content.split('\n')
+            if not title_list:
+                text_content = get_full_text()
                 
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # 匹配 "编号.标题" 或 "编号. 标题"
-                    match = re.match(r'^(\d+)\.\s*(.+)$', line)
-                    if match:
-                        news_id = int(match.group(1))
-                        title = match.group(2).strip()
-                        if title and len(title) > 3:
-                            title_dict[news_id] = title
+                # 匹配 "编号.标题" 或 "编号. 标题"
+                for match in _LINE_ITEM_RE.finditer(text_content):
+                    title = match.group(2)
+                    if len(title) > 3:
+                        title_list.append((int(match.group(1)), title))
+            
+            # 重复编号以后出现的为准，再按编号排序
+            title_list = sorted(dict(title_list).items(), key=itemgetter(0))
             
-            print(f"SecurityDigestParser: 从HTML中提取了 {len(title_dict)} 条新闻标题")
+            print(f"SecurityDigestParser: 从HTML中提取了 {len(title_list)} 条新闻标题")
             
             # 调试：显示前5条
-            if title_dict:
-                for i, (news_id, title) in enumerate(sorted(title_dict.items())[:5], 1):
+            if title_list:
+                for i, (news_id, title) in enumerate(title_list[:5], 1):
                     print(f"  {news_id}. {title[:60]}...")
             
         except Exception as e:
@@ -143,7 +179,7 @@ class SecurityDigestParser(BaseArticleParser):
             import traceback
             traceback.print_exc()
         
-        return title_dict
+        return title_list
 
     def _build_result(self) -> Dict[str, Any]:
         """构建最终的结构化数据结果
@@ -1,21 +1,41 @@
 import os
 import json
 import asyncio
+import tempfile
+import logging
 import re
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable, Type
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Pattern, Set, Tuple, Type
 
 # 导入爬虫和解析器模块
 from .playwright_wechat_crawler import WechatArticleCrawler
 from ..parsers import BaseArticleParser
 from ..parsers.security_digest_parser import SecurityDigestParser
 
+try:
+    # orjson 为可选依赖，未安装时回退到标准库 json
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+# 早报标题中的日期和期号，如 "5th域安全微讯早报【20250611】137期"
+_DIGEST_TITLE_RE = re.compile(r"(.*?)【(\d+)】(\d+)期")
+# _slugify 使用的字符过滤和空白替换
+_SLUG_REMOVE_RE = re.compile(r"[^\w\s-]")
+_SLUG_SPACES_RE = re.compile(r"\s+")
+
 
 class ArticleParserRegistry:
     """文章解析器注册表，根据文章标题选择合适的解析器"""
 
     def __init__(self):
-        self.parsers = {}  # 存储标题模式到解析器的映射
+        # 按注册顺序保存 (标题模式, 预编译正则, 解析器类)
+        self.parsers: List[Tuple[str, Pattern[str], Type[BaseArticleParser]]] = []
 
     def register(self, title_pattern: str, parser_class: Type[BaseArticleParser]):
         """注册解析器
@@ -24,7 +44,13 @@ class ArticleParserRegistry:
             title_pattern: 标题匹配模式（正则表达式）
             parser_class: 解析器类
         """
-        self.parsers[title_pattern] = parser_class
+        compiled = re.compile(title_pattern, re.IGNORECASE)
+        for index, (pattern, _, _) in enumerate(self.parsers):
+            if pattern == title_pattern:
+                # 重复注册同一模式时替换解析器，保持原有匹配顺序
+                self.parsers[index] = (title_pattern, compiled, parser_class)
+                return
+        self.parsers.append((title_pattern, compiled, parser_class))
 
     def get_parser(self, title: str) -> Optional[Type[BaseArticleParser]]:
         """根据文章标题获取合适的解析器
@@ -35,12 +61,55 @@ class ArticleParserRegistry:
         Returns:
             解析器类或None（如果没有匹配的解析器）
         """
-        for pattern, parser_class in self.parsers.items():
-            if re.search(pattern, title, re.IGNORECASE):
+        # 按注册顺序逐个匹配预编译的标题模式
+        for _, compiled, parser_class in self.parsers:
+            if compiled.search(title):
                 return parser_class
         return None
 
 
+def _dumps_json(data: Dict[str, Any]) -> bytes:
+    """将数据序列化为缩进两格的 UTF-8 JSON 字节串，优先使用 orjson"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # orjson 不接受 str 子类等类型，交给标准库处理
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _write_json_atomic(filepath: str, data: Dict[str, Any]) -> None:
+    """序列化为完整字节串后一次写入临时文件，再原子替换到目标路径
+
+    json.dump 会经由编码器分块多次写文件；先在内存中生成再用大缓冲区写出，
+    同时保证中途失败时不会留下半截的 JSON 文件。
+    """
+    payload = _dumps_json(data)
+    # 临时文件名唯一，并发保存同一路径时互不覆盖
+    f = tempfile.NamedTemporaryFile(
+        "wb",
+        buffering=1 << 17,
+        dir=os.path.dirname(filepath) or ".",
+        prefix=os.path.basename(filepath) + ".",
+        suffix=".tmp",
+        delete=False,
+    )
+    tmp_path = f.name
+    try:
+        with f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 # 全局解析器注册表
 parser_registry = ArticleParserRegistry()
 
@@ -51,6 +120,9 @@ parser_registry.register(r"^5th域安全微讯早报", SecurityDigestParser)
 class WechatArticleProcessor:
     """微信文章处理器"""
 
+    # 本进程中已创建过的输出目录，重复构造处理器时不再 makedirs
+    _created_dirs: Set[str] = set()
+
     def __init__(self, output_dir: str = "data/processed_articles"):
         """初始化处理器
 
@@ -58,7 +130,10 @@ class WechatArticleProcessor:
             output_dir: 处理结果输出目录
         """
         self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
+        self._out = Path(output_dir)
+        if output_dir not in WechatArticleProcessor._created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            WechatArticleProcessor._created_dirs.add(output_dir)
 
         # 初始化爬虫
         self.crawler = WechatArticleCrawler(
@@ -76,6 +151,8 @@ class WechatArticleProcessor:
             Dict: 处理结果，或None（如果处理失败）
         """
         article_data = None
+        # 本篇文章处理过程中统一使用同一时刻
+        now = datetime.now()
         
         # 1. 检查RSS条目是否已包含足够的内容
         if rss_entry:
@@ -85,26 +162,28 @@ class WechatArticleProcessor:
                     rss_content_html = rss_entry.content[0].get("value", "")
             
             if len(rss_content_html) > 100:
-                print(f"RSS内容足够长 ({len(rss_content_html)} 字符)，跳过Playwright爬虫，直接使用RSS内容")
+                logger.info(
+                    "RSS内容足够长 (%d 字符)，跳过Playwright爬虫，直接使用RSS内容", len(rss_content_html)
+                )
                 
                 # 从RSS entry.title提取元数据
                 title = getattr(rss_entry, "title", "")
                 
                 # 解析标题中的日期和期号（针对5th域安全微讯早报等格式）
-                title_match = re.search(r"(.*?)【(\d+)】(\d+)期", title)
+                title_match = _DIGEST_TITLE_RE.search(title)
                 digest_date = ""
                 issue_number = ""
                 if title_match:
                     digest_date = title_match.group(2)
                     issue_number = title_match.group(3)
-                    print(f"  提取元数据 - 日期: {digest_date}, 期号: {issue_number}")
+                    logger.debug("提取元数据 - 日期: %s, 期号: %s", digest_date, issue_number)
                 
                 # 构造模拟的article_data，跳过爬虫
                 article_data = {
                     "success": True,
                     "title": title,
                     "content": rss_content_html,
-                    "crawl_time": datetime.now().isoformat(),
+                    "crawl_time": now.isoformat(),
                     "source": "rss_content",  # 标记来源
                     "digest_date": digest_date,  # 新增：从标题提取的日期
                     "issue_number": issue_number,  # 新增：从标题提取的期号
@@ -112,11 +191,11 @@ class WechatArticleProcessor:
         
         # 2. 如果RSS内容不足或未提供，使用爬虫抓取
         if not article_data:
-            print(f"使用Playwright爬虫抓取文章: {url}")
+            logger.info("使用Playwright爬虫抓取文章: %s", url)
             article_data = await self.crawler.crawl_article(url)
 
         if not article_data or not article_data.get("success", False):
-            print(f"爬取文章失败: {url}")
+            logger.warning("爬取文章失败: %s", url)
             return None
 
         # 3. 解析文章内容
@@ -124,18 +203,18 @@ class WechatArticleProcessor:
         content = article_data.get("content", "")
 
         if not title or not content:
-            print(f"文章标题或内容为空: {url}")
+            logger.warning("文章标题或内容为空: %s", url)
             return None
 
-        print(f"成功爬取文章: {title}")
+        logger.info("成功爬取文章: %s", title)
 
         # 3. 根据标题选择解析器
         parser_class = parser_registry.get_parser(title)
 
         if not parser_class:
-            print(f"未找到适用于标题 '{title}' 的解析器")
+            logger.info("未找到适用于标题 '%s' 的解析器", title)
             # 保存原始内容，以便后续手动处理
-            self._save_raw_article(article_data, "no_parser")
+            self._save_raw_article(article_data, "no_parser", now=now)
             return article_data
 
         # 4. 使用解析器处理内容
@@ -154,12 +233,10 @@ class WechatArticleProcessor:
             # 5. 添加元数据
             parsed_data["source_url"] = url
             parsed_data["original_title"] = title
-            parsed_data["crawl_time"] = article_data.get(
-                "crawl_time", datetime.now().isoformat()
-            )
+            parsed_data["crawl_time"] = article_data.get("crawl_time") or now.isoformat()
 
             # 6. 保存结果
-            result = self._save_parsed_article(parsed_data)
+            result = self._save_parsed_article(parsed_data, now=now)
             
             # 7. 将article_data中的重要字段添加到result中
             result["source"] = article_data.get("source", "crawler")
@@ -167,50 +244,53 @@ class WechatArticleProcessor:
             result["issue_number"] = article_data.get("issue_number", "")
             result["content"] = article_data.get("content", "")
             
-            print(f"result: {result}")
-            print(result)
-            print("=" * 50)
-            print(f"raw_content: {article_data.get('content', '')[:500]}...")
-            print("=" * 50)
-            print(f"成功解析文章: {title}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("result keys=%s", list(result))
+                logger.debug("raw_content: %s...", article_data.get("content", "")[:500])
+            logger.info("成功解析文章: %s", title)
             return result
         except Exception as e:
-            print(f"解析文章时出错: {str(e)}")
+            logger.warning("解析文章时出错: %s", e, exc_info=True)
             # 保存原始内容，以便后续手动处理
-            self._save_raw_article(article_data, "parse_error")
+            self._save_raw_article(article_data, "parse_error", now=now)
             return article_data
 
-    def _save_raw_article(self, article_data: Dict[str, Any], reason: str) -> str:
+    def _save_raw_article(
+        self, article_data: Dict[str, Any], reason: str, now: Optional[datetime] = None
+    ) -> str:
         """保存原始文章数据
 
         Args:
             article_data: 爬取的原始文章数据
             reason: 保存原因（no_parser或parse_error）
+            now: 本次处理的时间（可选），缺省时取当前时间
 
         Returns:
             str: 保存的文件路径
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
         title_slug = self._slugify(article_data.get("title", "untitled"))
         filename = f"{timestamp}_{title_slug}_{reason}.json"
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = str(self._out / filename)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(article_data, f, ensure_ascii=False, indent=2)
+        _write_json_atomic(filepath, article_data)
 
-        print(f"原始文章已保存到: {filepath}")
+        logger.info("原始文章已保存到: %s", filepath)
         return filepath
 
-    def _save_parsed_article(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _save_parsed_article(
+        self, parsed_data: Dict[str, Any], now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """保存解析后的文章数据
 
         Args:
             parsed_data: 解析后的文章数据
+            now: 本次处理的时间（可选），缺省时取当前时间
 
         Returns:
             Dict: 包含保存信息的结果
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
         title = parsed_data.get("title", "")
         title_slug = self._slugify(title)
 
@@ -220,12 +300,11 @@ class WechatArticleProcessor:
         else:
             filename = f"{timestamp}_{title_slug}.json"
 
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = str(self._out / filename)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(parsed_data, f, ensure_ascii=False, indent=2)
+        _write_json_atomic(filepath, parsed_data)
 
-        print(f"解析结果已保存到: {filepath}")
+        logger.info("解析结果已保存到: %s", filepath)
 
         # 返回结果
         return {
@@ -245,12 +324,8 @@ class WechatArticleProcessor:
         Returns:
             str: URL友好的文本
         """
-        # 移除非字母数字字符
-        text = re.sub(r"[^\w\s-]", "", text)
-        # 将空格替换为下划线
-        text = re.sub(r"\s+", "_", text)
-        # 限制长度
-        return text[:50]
+        # 移除非字母数字字符，再将空格替换为下划线，并限制长度
+        return _SLUG_SPACES_RE.sub("_", _SLUG_REMOVE_RE.sub("", text))[:50]
 
 
 async def process_url(url: str, rss_entry: Optional[Any] = None) -> Optional[Dict[str, Any]]:
@@ -1,3 +1,9 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
  
-Base = declarative_base() 
\ No newline at end of file
+Base = declarative_base() 
+
+# JSON列类型：PostgreSQL上使用预解析存储的JSONB，读取时不必重新解析文本；
+# SQLite等其他数据库仍为普通JSON
+JSONType = JSON().with_variant(JSONB(), "postgresql")
@@ -0,0 +1,173 @@
+"""
+迁移脚本公用的SQLite连接工具
+
+迁移驱动（run_migrations / update_schema）只打开一个连接并依次传给各迁移，
+单独运行某个迁移脚本时仍由脚本自行连接。
+"""
+
+import functools
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+# 批量执行迁移时的连接参数：WAL 模式下提交只需追加日志，
+# synchronous=NORMAL 在 WAL 下仍能保证崩溃后数据库一致；
+# 加大页缓存并启用内存映射，回填新列时不必反复读盘
+MIGRATION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 约 64MB（负数单位为 KiB）
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+)
+
+
+def tune_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """为迁移连接设置性能相关的PRAGMA"""
+    for pragma in MIGRATION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# 结构变更后刷新查询规划器统计信息；analysis_limit 限制每个索引的采样行数，
+# 统计信息未过期时 optimize 几乎不做任何事
+OPTIMIZE_PRAGMAS = (
+    "PRAGMA analysis_limit=400",
+    "PRAGMA optimize",
+)
+
+
+def optimize_connection(conn) -> None:
+    """在关闭连接前执行 PRAGMA optimize（也接受SQLAlchemy的raw_connection）"""
+    for pragma in OPTIMIZE_PRAGMAS:
+        conn.execute(pragma)
+
+
+def open_connection(db_path: str) -> sqlite3.Connection:
+    """打开供整批迁移共用的连接"""
+    return tune_connection(sqlite3.connect(db_path))
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine(db_path: str):
+    """基于SQLAlchemy的迁移共用的引擎，每个数据库文件只创建一次"""
+    from sqlalchemy import create_engine
+
+    return create_engine(f"sqlite:///{db_path}")
+
+
+def snapshot_columns(
+    conn: sqlite3.Connection, tables: Iterable[str]
+) -> Dict[str, Set[str]]:
+    """一次读取多张表的列名，供同一批迁移共用（表不存在时为空集合）"""
+    return {
+        table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for table in tables
+    }
+
+
+def existing_columns(
+    cursor: sqlite3.Cursor,
+    table: str,
+    existing_cols: Optional[Dict[str, Set[str]]] = None,
+) -> Set[str]:
+    """返回表的列名集合
+
+    传入快照时直接复用快照中的集合，迁移新增列后应把列名加入该集合，
+    保证后续迁移看到的仍是最新结构。
+    """
+    if existing_cols is not None and table in existing_cols:
+        return existing_cols[table]
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if existing_cols is not None:
+        existing_cols[table] = columns
+    return columns
+
+
+def pending_column_ddl(
+    existing_cols: Dict[str, Set[str]], table: str, column: str, sql: str
+) -> List[str]:
+    """加列迁移的 build_ddl 公用实现：表不存在或列已存在时返回空列表，否则返回 [sql]"""
+    columns = existing_cols.get(table)
+    if not columns or column in columns:
+        return []
+    return [sql]
+
+
+def ensure_versions_table(conn: sqlite3.Connection) -> None:
+    """确保记录已完成迁移的 schema_migrations 表存在"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version TEXT PRIMARY KEY, applied_at DATETIME)"
+    )
+
+
+def applied_versions(conn: sqlite3.Connection) -> Set[str]:
+    """返回已记录为完成的迁移版本"""
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+
+
+def mark_applied(conn: sqlite3.Connection, version: str) -> None:
+    """记录迁移已完成，之后启动时直接跳过"""
+    conn.execute(
+        "INSERT OR IGNORE INTO schema_migrations(version, applied_at) "
+        "VALUES (?, CURRENT_TIMESTAMP)",
+        (version,),
+    )
+    conn.commit()
+
+
+@contextmanager
+def migration_connection(
+    db_path: str, conn: Optional[sqlite3.Connection] = None
+) -> Iterator[sqlite3.Connection]:
+    """获取单个迁移使用的连接
+
+    传入共享连接时直接复用且不关闭；否则按 db_path 新建连接，结束时关闭。
+    """
+    if conn is not None:
+        # 调用方已开启的外层事务由调用方负责提交或回滚
+        outer_txn = conn.in_transaction
+        try:
+            yield conn
+        finally:
+            # 与独立连接关闭时的行为保持一致：丢弃迁移中未提交的修改
+            if conn.in_transaction and not outer_txn:
+                conn.rollback()
+        return
+
+    own_conn = sqlite3.connect(db_path)
+    try:
+        yield own_conn
+    finally:
+        own_conn.close()
+
+
+@contextmanager
+def migration_txn(
+    db_path: str, conn: Optional[sqlite3.Connection] = None
+) -> Iterator[sqlite3.Cursor]:
+    """在一个显式事务（BEGIN IMMEDIATE）中执行迁移，正常结束提交，异常时回滚
+
+    ALTER 与随后的 UPDATE 合并到同一次提交，只需一次同步落盘。
+    未传入共享连接时自行连接并在结束后关闭；共享连接上已有外层事务时
+    直接加入，由外层负责提交。
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = tune_connection(sqlite3.connect(db_path, isolation_level=None))
+    try:
+        if conn.in_transaction:
+            yield conn.cursor()
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        if own_conn:
+            conn.close()
@@ -32,19 +32,19 @@ def migration_add_cron_config():
         db = SessionLocal()
         try:
             default_configs = [
-                CronConfig(
+                dict(
                     task_name='crawl_sources',
                     cron_expression='0 */1 * * *',
                     enabled=True,
                     description='新闻源抓取任务 - 每小时执行一次'
                 ),
-                CronConfig(
+                dict(
                     task_name='event_groups',
                     cron_expression='30 */1 * * *',
                     enabled=True,
                     description='事件分组任务 - 每小时执行一次（错开抓取任务）'
                 ),
-                CronConfig(
+                dict(
                     task_name='cache_cleanup',
                     cron_expression='0 2 * * *',
                     enabled=True,
@@ -52,8 +52,9 @@ def migration_add_cron_config():
                 )
             ]
             
-            for config in default_configs:
-                db.add(config)
+            # 走 Core 的 executemany 一次插入，绕开 ORM 的逐行单元工作；
+            # created_at/updated_at 的 Python 端默认值仍会按行填充
+            db.execute(CronConfig.__table__.insert(), default_configs)
             
             db.commit()
             logger.info(f"✓ 成功插入 {len(default_configs)} 条默认cron配置")
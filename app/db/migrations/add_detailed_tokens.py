@@ -3,46 +3,46 @@
 """
 import sqlite3
 import logging
-from sqlalchemy import create_engine, MetaData, Table
+from sqlalchemy import text
 
-# 设置日志
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-metadata = MetaData()
+from app.db.migrations._common import get_engine
 
+logger = logging.getLogger(__name__)
 
 def migrate(connection):
-    # 获取sources表
-    sources = Table("sources", metadata, autoload_with=connection)
+    # 直接读取sources表的列名，无需反射整张表
+    columns = {
+        row[1] for row in connection.execute(text("PRAGMA table_info(sources)"))
+    }
 
     # 检查字段是否已存在
     fields_to_add = []
-    if "prompt_tokens" not in sources.c:
+    if "prompt_tokens" not in columns:
         fields_to_add.append("prompt_tokens INTEGER DEFAULT 0")
-    if "completion_tokens" not in sources.c:
+    if "completion_tokens" not in columns:
         fields_to_add.append("completion_tokens INTEGER DEFAULT 0")
 
     if fields_to_add:
         # 添加字段
         for field in fields_to_add:
-            connection.execute(f"ALTER TABLE sources ADD COLUMN {field}")
+            connection.execute(text(f"ALTER TABLE sources ADD COLUMN {field}"))
         
         logger.info(f"已添加字段到sources表: {', '.join(fields_to_add)}")
         
         # 如果tokens_used已有数据，将其均分到prompt_tokens和completion_tokens
-        connection.execute("""
+        connection.execute(text("""
             UPDATE sources 
             SET prompt_tokens = CAST(tokens_used * 0.7 AS INTEGER), 
                 completion_tokens = CAST(tokens_used * 0.3 AS INTEGER) 
             WHERE tokens_used > 0
-        """)
+        """))
         logger.info("已将现有tokens_used数据分配到prompt_tokens和completion_tokens")
         
         return True
     else:
         logger.info("prompt_tokens和completion_tokens字段已存在，无需迁移")
-        return False
+        # 已完成的迁移返回True，由迁移驱动记入 schema_migrations 后不再检查
+        return True
 
 
 def run_migration(db_path="daily_digest.db"):
@@ -53,14 +53,13 @@ def run_migration(db_path="daily_digest.db"):
     - db_path: 数据库文件路径
     
     返回:
-    - 布尔值，表示是否执行了迁移
+    - 布尔值，迁移是否已完成（本次执行或此前已存在）；出错时为False
     """
     logger.info("开始执行添加详细token字段的迁移...")
     
     try:
-        # 创建数据库连接
-        engine = create_engine(f"sqlite:///{db_path}")
-        with engine.connect() as connection:
+        # 复用共享引擎，整个迁移在一个事务中执行并在结束时提交
+        with get_engine(db_path).begin() as connection:
             # 执行迁移
             result = migrate(connection)
             return result
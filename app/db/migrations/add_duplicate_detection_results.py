@@ -5,60 +5,58 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float
 from sqlalchemy.sql import func
 from app.db.base import Base
+from app.db.migrations._common import migration_connection
+
+
+# 建表和索引放在一个脚本中，经 executescript 一次提交，只产生一次日志同步
+DDL_SCRIPT = """
+BEGIN;
+CREATE TABLE IF NOT EXISTS duplicate_detection_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    digest_id INTEGER NOT NULL,
+    news_id INTEGER NOT NULL,
+    status VARCHAR(20) DEFAULT 'checking',
+    duplicate_with_news_id INTEGER NULL,
+    similarity_score FLOAT NULL,
+    llm_reasoning TEXT NULL,
+    checked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (digest_id) REFERENCES digests (id),
+    FOREIGN KEY (news_id) REFERENCES news (id),
+    FOREIGN KEY (duplicate_with_news_id) REFERENCES news (id)
+);
+CREATE INDEX IF NOT EXISTS idx_duplicate_detection_digest_id
+ON duplicate_detection_results (digest_id);
+CREATE INDEX IF NOT EXISTS idx_duplicate_detection_news_id
+ON duplicate_detection_results (news_id);
+CREATE INDEX IF NOT EXISTS idx_duplicate_detection_status
+ON duplicate_detection_results (status);
+COMMIT;
+"""
 
+DROP_SCRIPT = """
+BEGIN;
+DROP INDEX IF EXISTS idx_duplicate_detection_status;
+DROP INDEX IF EXISTS idx_duplicate_detection_news_id;
+DROP INDEX IF EXISTS idx_duplicate_detection_digest_id;
+DROP TABLE IF EXISTS duplicate_detection_results;
+COMMIT;
+"""
 
-def upgrade(db_path):
-    """升级数据库结构"""
-    import sqlite3
-
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    try:
-        # 创建重复检测结果表
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS duplicate_detection_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                digest_id INTEGER NOT NULL,
-                news_id INTEGER NOT NULL,
-                status VARCHAR(20) DEFAULT 'checking',
-                duplicate_with_news_id INTEGER NULL,
-                similarity_score FLOAT NULL,
-                llm_reasoning TEXT NULL,
-                checked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (digest_id) REFERENCES digests (id),
-                FOREIGN KEY (news_id) REFERENCES news (id),
-                FOREIGN KEY (duplicate_with_news_id) REFERENCES news (id)
-            )
-        """)
-
-        # 创建索引以提高查询性能
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_duplicate_detection_digest_id
-            ON duplicate_detection_results (digest_id)
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_duplicate_detection_news_id
-            ON duplicate_detection_results (news_id)
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_duplicate_detection_status
-            ON duplicate_detection_results (status)
-        """)
 
-        conn.commit()
-        print("重复检测结果表已创建")
+def upgrade(db_path, conn=None):
+    """升级数据库结构"""
+    with migration_connection(db_path, conn) as conn:
+        try:
+            # 创建重复检测结果表及查询用的索引
+            conn.executescript(DDL_SCRIPT)
+            print("重复检测结果表已创建")
 
-    except Exception as e:
-        conn.rollback()
-        print(f"创建重复检测结果表失败: {e}")
-        raise
-    finally:
-        conn.close()
+        except Exception as e:
+            conn.rollback()
+            print(f"创建重复检测结果表失败: {e}")
+            raise
 
 
 def downgrade(db_path):
@@ -66,18 +64,10 @@ def downgrade(db_path):
     import sqlite3
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
     try:
-        # 删除索引
-        cursor.execute("DROP INDEX IF EXISTS idx_duplicate_detection_status")
-        cursor.execute("DROP INDEX IF EXISTS idx_duplicate_detection_news_id")
-        cursor.execute("DROP INDEX IF EXISTS idx_duplicate_detection_digest_id")
-
-        # 删除表
-        cursor.execute("DROP TABLE IF EXISTS duplicate_detection_results")
-
-        conn.commit()
+        # 删除索引和表
+        conn.executescript(DROP_SCRIPT)
         print("重复检测结果表已删除")
 
     except Exception as e:
@@ -89,5 +79,5 @@ def downgrade(db_path):
 
 
 # 为了兼容现有迁移系统
-def run_migration(db_path):
-    upgrade(db_path)
\ No newline at end of file
+def run_migration(db_path, conn=None):
+    upgrade(db_path, conn)
\ No newline at end of file
@@ -2,43 +2,43 @@
 添加重复检测状态字段到快报表
 """
 
-def upgrade(db_path: str):
-    """应用迁移"""
-    import sqlite3
+import sqlite3
+from typing import Optional
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+from app.db.migrations._common import migration_connection
 
-    try:
-        # 添加重复检测状态字段
-        cursor.execute("""
-            ALTER TABLE digests
-            ADD COLUMN duplicate_detection_status VARCHAR(20) DEFAULT 'pending' NOT NULL
-        """)
 
-        # 为现有快报设置默认状态
-        cursor.execute("""
-            UPDATE digests
-            SET duplicate_detection_status = 'pending'
-            WHERE duplicate_detection_status IS NULL
-        """)
+def upgrade(db_path: str, conn: Optional[sqlite3.Connection] = None):
+    """应用迁移"""
+    with migration_connection(db_path, conn) as conn:
+        cursor = conn.cursor()
 
-        conn.commit()
-        print("✅ 已添加重复检测状态字段")
+        try:
+            # 添加重复检测状态字段
+            cursor.execute("""
+                ALTER TABLE digests
+                ADD COLUMN duplicate_detection_status VARCHAR(20) DEFAULT 'pending' NOT NULL
+            """)
 
-    except sqlite3.OperationalError as e:
-        if "duplicate column name" in str(e):
-            print("⚠️  重复检测状态字段已存在，跳过迁移")
-        else:
-            raise e
-    finally:
-        conn.close()
+            # 为现有快报设置默认状态
+            cursor.execute("""
+                UPDATE digests
+                SET duplicate_detection_status = 'pending'
+                WHERE duplicate_detection_status IS NULL
+            """)
+
+            conn.commit()
+            print("✅ 已添加重复检测状态字段")
+
+        except sqlite3.OperationalError as e:
+            if "duplicate column name" in str(e):
+                print("⚠️  重复检测状态字段已存在，跳过迁移")
+            else:
+                raise e
 
 
 def downgrade(db_path: str):
     """回滚迁移"""
-    import sqlite3
-
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
@@ -71,6 +71,11 @@ def downgrade(db_path: str):
         conn.close()
 
 
+# 为了兼容现有迁移系统
+def run_migration(db_path: str, conn: Optional[sqlite3.Connection] = None):
+    upgrade(db_path, conn)
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
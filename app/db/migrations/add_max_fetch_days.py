@@ -5,17 +5,37 @@
 
 import sqlite3
 import logging
-from typing import Optional
+from typing import Dict, Optional, Set
+
+from app.db.migrations._common import (
+    existing_columns,
+    migration_txn,
+    pending_column_ddl,
+)
 
 logger = logging.getLogger(__name__)
 
+# 本迁移新增的列
+ADD_COLUMN_SQL = "ALTER TABLE sources ADD COLUMN max_fetch_days INTEGER DEFAULT 7"
+
+
+def build_ddl(existing_cols):
+    """返回尚需执行的DDL（sources表不存在或列已存在时为空列表），供迁移驱动合并成一个脚本执行"""
+    return pending_column_ddl(existing_cols, "sources", "max_fetch_days", ADD_COLUMN_SQL)
 
-def migrate_add_max_fetch_days(db_path: str) -> bool:
+
+def migrate_add_max_fetch_days(
+    db_path: str,
+    conn: Optional[sqlite3.Connection] = None,
+    existing_cols: Optional[Dict[str, Set[str]]] = None,
+) -> bool:
     """
     为sources表添加max_fetch_days列
     
     Args:
         db_path: 数据库文件路径
+        conn: 迁移驱动传入的共享连接（可选），传入时不会关闭
+        existing_cols: 迁移驱动预先读取的 {表名: 列名集合} 快照（可选）
     
     Returns:
         bool: 迁移是否成功
@@ -23,44 +43,26 @@ def migrate_add_max_fetch_days(db_path: str) -> bool:
     logger.info(f"开始执行迁移: 添加max_fetch_days字段到sources表 (数据库: {db_path})")
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # 检查字段是否已存在
-        cursor.execute("PRAGMA table_info(sources)")
-        columns = [column[1] for column in cursor.fetchall()]
+        with migration_txn(db_path, conn) as cursor:
+            # 检查字段是否已存在
+            columns = existing_columns(cursor, "sources", existing_cols)
         
-        if 'max_fetch_days' in columns:
-            logger.info("max_fetch_days 字段已存在，跳过迁移")
-            return True
+            if 'max_fetch_days' in columns:
+                logger.info("max_fetch_days 字段已存在，跳过迁移")
+                return True
         
-        # 添加max_fetch_days字段，默认值为7天
-        cursor.execute("""
-            ALTER TABLE sources 
-            ADD COLUMN max_fetch_days INTEGER DEFAULT 7
-        """)
+            # 添加max_fetch_days字段，默认值为7天；
+            # 常量默认值会直接作用于已有记录，无需再逐行 UPDATE
+            cursor.execute(ADD_COLUMN_SQL)
+            columns.add("max_fetch_days")
         
-        # 为现有记录设置默认值
-        cursor.execute("""
-            UPDATE sources 
-            SET max_fetch_days = 7 
-            WHERE max_fetch_days IS NULL
-        """)
-        
-        conn.commit()
-        logger.info("max_fetch_days字段添加成功")
-        
-        return True
+            logger.info("max_fetch_days字段添加成功")
         
+            return True
+
     except Exception as e:
         logger.error(f"添加max_fetch_days字段失败: {str(e)}")
-        if 'conn' in locals():
-            conn.rollback()
         return False
-        
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 
 if __name__ == "__main__":
@@ -3,54 +3,57 @@
 """
 
 import logging
-import sqlite3
 
-# 配置日志
-logging.basicConfig(level=logging.INFO)
+from app.db.migrations._common import (
+    existing_columns,
+    migration_txn,
+    pending_column_ddl,
+)
+
 logger = logging.getLogger(__name__)
 
-def run_migration(db_path="daily_digest.db"):
+# 本迁移新增的列
+ADD_COLUMN_SQL = "ALTER TABLE news ADD COLUMN newspaper_keywords JSON"
+
+
+def build_ddl(existing_cols):
+    """返回尚需执行的DDL（news表不存在或列已存在时为空列表），供迁移驱动合并成一个脚本执行"""
+    return pending_column_ddl(existing_cols, "news", "newspaper_keywords", ADD_COLUMN_SQL)
+
+def run_migration(db_path="daily_digest.db", conn=None, existing_cols=None):
     """执行迁移添加newspaper_keywords字段"""
     logger.info(f"开始迁移：添加newspaper_keywords列到news表 (数据库: {db_path})")
     
     try:
-        # 连接数据库
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        # 在单个事务中完成检查与修改（迁移驱动传入共享连接时直接复用，
+        # 共享连接上已有外层事务时由外层统一提交）
+        with migration_txn(db_path, conn) as cursor:
+            # 检查字段是否已存在（没有任何列说明表不存在）
+            columns = existing_columns(cursor, "news", existing_cols)
+            if not columns:
+                logger.warning("news表不存在，无需迁移")
+                return False
         
-        # 检查表是否存在
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='news'")
-        if not cursor.fetchone():
-            logger.warning("news表不存在，无需迁移")
-            conn.close()
-            return False
+            if "newspaper_keywords" in columns:
+                logger.info("newspaper_keywords字段已存在，无需添加")
+                # 已完成的迁移返回True，由迁移驱动记入 schema_migrations 后不再检查
+                return True
             
-        # 检查字段是否已存在
-        cursor.execute("PRAGMA table_info(news)")
-        columns = [col[1] for col in cursor.fetchall()]
+            # 添加新字段
+            logger.info("添加newspaper_keywords字段...")
+            cursor.execute(ADD_COLUMN_SQL)
+            columns.add("newspaper_keywords")
         
-        if "newspaper_keywords" in columns:
-            logger.info("newspaper_keywords字段已存在，无需添加")
-            conn.close()
-            return False
-            
-        # 添加新字段
-        logger.info("添加newspaper_keywords字段...")
-        cursor.execute("ALTER TABLE news ADD COLUMN newspaper_keywords JSON")
-        
-        # 提交更改
-        conn.commit()
-        logger.info("迁移完成：成功添加newspaper_keywords字段")
-        
-        # 关闭连接
-        conn.close()
-        return True
+            logger.info("迁移完成：成功添加newspaper_keywords字段")
         
+            return True
+
     except Exception as e:
         logger.error(f"迁移失败: {str(e)}")
         return False
         
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # 当脚本直接运行时执行迁移
     success = run_migration()
     if success:
@@ -3,9 +3,20 @@
 """
 import logging
 import sqlite3
+from typing import Dict, List, Optional
+
+from app.db.migrations._common import migration_connection
 
 logger = logging.getLogger(__name__)
 
+# 重建期间使用的连接参数：放大页缓存并启用内存映射，
+# 复制和删除旧表时不必反复从磁盘读回已被淘汰的页
+_REBUILD_PRAGMAS = {
+    "cache_size": -500000,  # 约 500MB（负数单位为 KiB），按需分配
+    "mmap_size": 1 << 30,
+    "temp_store": 2,  # MEMORY
+}
+
 
 CREATE_TABLE_SQL = """
 CREATE TABLE sources_new (
@@ -80,47 +91,48 @@ FROM sources;
 """
 
 
-def _needs_migration(cursor) -> bool:
+def _schema_snapshot(cursor) -> Dict[str, Optional[str]]:
+    """一次查询sqlite_master，取得迁移涉及的表的建表语句 {表名: sql}"""
     cursor.execute(
-        "SELECT sql FROM sqlite_master WHERE type='table' AND name='sources';"
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type='table' AND name IN ('sources', 'sqlite_sequence');"
     )
-    row = cursor.fetchone()
-    if not row or not row[0]:
-        logger.warning("未找到sources表，跳过AUTOINCREMENT迁移")
-        return False
-    return "AUTOINCREMENT" not in row[0].upper()
+    return {name: sql for name, sql in cursor.fetchall()}
 
 
-def _update_sqlite_sequence(cursor):
+def _needs_migration(snapshot: Dict[str, Optional[str]]) -> bool:
+    """sources表存在但尚未启用AUTOINCREMENT（调用方已确认表存在）"""
+    return "AUTOINCREMENT" not in snapshot["sources"].upper()
+
+
+def _capture_index_sql(cursor) -> List[str]:
+    """记录sources表上现有索引的建表语句（不含SQLite自动生成的索引）"""
     cursor.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='sqlite_sequence';"
+        "SELECT sql FROM sqlite_master "
+        "WHERE type='index' AND tbl_name='sources' AND sql IS NOT NULL;"
     )
-    has_sequence = cursor.fetchone() is not None
-    if not has_sequence:
-        return
+    return [row[0] for row in cursor.fetchall()]
 
-    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM sources;")
-    max_id = cursor.fetchone()[0] or 0
 
-    # 考虑仍然存在的引用（如news表中的source_id）
-    reference_queries = [
-        "SELECT COALESCE(MAX(source_id), 0) FROM news;"
-    ]
-
-    for query in reference_queries:
-        try:
-            cursor.execute(query)
-            value = cursor.fetchone()[0] or 0
-            if value > max_id:
-                max_id = value
-        except sqlite3.OperationalError:
-            # 目标表不存在时忽略
-            continue
+def _update_sqlite_sequence(cursor):
+    # 新建带AUTOINCREMENT的sources表时SQLite已自动创建sqlite_sequence，无需再检查
+    # 考虑仍然存在的引用（如news表中的source_id），先确认该列存在，
+    # 避免在news表缺失时靠捕获OperationalError兜底
+    cursor.execute(
+        "SELECT COUNT(*) FROM pragma_table_info('news') WHERE name='source_id';"
+    )
+    max_sql = "SELECT COALESCE(MAX(id), 0) AS v FROM sources"
+    if cursor.fetchone()[0]:
+        max_sql += " UNION ALL SELECT COALESCE(MAX(source_id), 0) FROM news"
 
+    # 最大ID和序列行是否存在一次查询取回
     cursor.execute(
-        "SELECT COUNT(*) FROM sqlite_sequence WHERE name='sources';"
+        f"SELECT (SELECT MAX(v) FROM ({max_sql})), "
+        "(SELECT COUNT(*) FROM sqlite_sequence WHERE name='sources');"
     )
-    exists = cursor.fetchone()[0] > 0
+    max_id, sequence_rows = cursor.fetchone()
+    max_id = max_id or 0
+    exists = sequence_rows > 0
 
     if exists:
         cursor.execute(
@@ -133,37 +145,71 @@ def _update_sqlite_sequence(cursor):
         )
 
 
-def run_migration(db_path="daily_digest.db") -> bool:
+def run_migration(
+    db_path="daily_digest.db", conn: Optional[sqlite3.Connection] = None
+) -> bool:
     """
     运行迁移，确保sources.id不再复用
 
+    参数:
+        conn: 迁移驱动传入的共享连接（可选），传入时不会关闭
+
     返回:
-        bool: 是否执行了迁移
+        bool: 迁移是否已完成（本次执行或此前已完成）；sources表不存在时为False
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
-    try:
+    with migration_connection(db_path, conn) as conn:
         cursor = conn.cursor()
+        snapshot = _schema_snapshot(cursor)
 
-        if not _needs_migration(cursor):
-            logger.info("sources表已启用AUTOINCREMENT，跳过迁移")
+        if not snapshot.get("sources"):
+            logger.warning("未找到sources表，跳过AUTOINCREMENT迁移")
             return False
+        if not _needs_migration(snapshot):
+            logger.info("sources表已启用AUTOINCREMENT，跳过迁移")
+            # 已完成的迁移返回True，由迁移驱动记入 schema_migrations 后不再检查
+            return True
 
         logger.info("开始执行sources AUTOINCREMENT迁移")
 
+        # 重建表必须关闭外键（外键开启时 DROP TABLE 会隐式删除全部行，
+        # 即使用 defer_foreign_keys 推迟检查，提交时也会报外键冲突）；
+        # 共享连接上还会执行其他迁移，结束后恢复原来的外键设置
+        cursor.execute("PRAGMA foreign_keys;")
+        foreign_keys = cursor.fetchone()[0]
         cursor.execute("PRAGMA foreign_keys=OFF;")
-        cursor.execute("BEGIN;")
+        previous_pragmas = {}
+        for name, value in _REBUILD_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name};")
+            previous_pragmas[name] = cursor.fetchone()[0]
+            cursor.execute(f"PRAGMA {name}={value};")
+        # 立即取得写锁，避免复制到一半时与其他写入者冲突
+        cursor.execute("BEGIN IMMEDIATE;")
 
         try:
+            # 记录重建前已有的外键冲突数（如引用已删除源的新闻），
+            # 提交前确认重建没有引入新的冲突
+            cursor.execute("PRAGMA foreign_key_check;")
+            violations_before = len(cursor.fetchall())
+
+            # 新表先不建索引，数据复制完成后再统一重建原有索引，
+            # 避免复制过程中逐行维护索引（DROP TABLE 会一并删除旧索引）
+            index_sql = _capture_index_sql(cursor)
             cursor.execute(CREATE_TABLE_SQL)
             cursor.execute(COPY_DATA_SQL)
             cursor.execute("DROP TABLE sources;")
             cursor.execute("ALTER TABLE sources_new RENAME TO sources;")
+            for sql in index_sql:
+                cursor.execute(sql)
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS ix_sources_id ON sources (id);"
             )
             _update_sqlite_sequence(cursor)
+            cursor.execute("PRAGMA foreign_key_check;")
+            violations_after = len(cursor.fetchall())
+            if violations_after > violations_before:
+                raise sqlite3.IntegrityError(
+                    f"sources表重建后外键冲突由 {violations_before} 条增加到 {violations_after} 条"
+                )
             conn.commit()
             logger.info("sources表已重建并启用AUTOINCREMENT")
         except Exception as exc:
@@ -171,11 +217,18 @@ def run_migration(db_path="daily_digest.db") -> bool:
             logger.error("sources AUTOINCREMENT迁移失败，已回滚", exc_info=True)
             raise exc
         finally:
-            cursor.execute("PRAGMA foreign_keys=ON;")
+            cursor.execute(f"PRAGMA foreign_keys={'ON' if foreign_keys else 'OFF'};")
+            for name, value in previous_pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value};")
+
+        # 回收旧sources表删除后留下的空闲页；VACUUM 不能在事务中执行，
+        # 放在提交之后，失败也不影响已完成的迁移
+        try:
+            cursor.execute("VACUUM;")
+        except sqlite3.OperationalError:
+            logger.warning("sources表重建后VACUUM失败，跳过空间回收", exc_info=True)
 
         return True
-    finally:
-        conn.close()
 
 
 if __name__ == "__main__":
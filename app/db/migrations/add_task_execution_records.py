@@ -17,7 +17,7 @@ def upgrade():
         logger.info("开始添加任务执行记录表...")
         
         # 创建任务执行记录表
-        create_table_sql = text("""
+        create_table_sql = """
         CREATE TABLE IF NOT EXISTS task_executions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             task_type VARCHAR(100) NOT NULL,
@@ -53,9 +53,7 @@ def upgrade():
             created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
             updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
         )
-        """)
-        
-        db.execute(create_table_sql)
+        """
         
         # 创建索引
         indexes_sql = [
@@ -67,11 +65,8 @@ def upgrade():
             "CREATE INDEX IF NOT EXISTS idx_task_executions_created_at ON task_executions(created_at)"
         ]
         
-        for index_sql in indexes_sql:
-            db.execute(text(index_sql))
-        
         # 创建触发器来自动更新 updated_at 字段
-        trigger_sql = text("""
+        trigger_sql = """
         CREATE TRIGGER IF NOT EXISTS update_task_executions_updated_at
         AFTER UPDATE ON task_executions
         FOR EACH ROW
@@ -80,9 +75,11 @@ def upgrade():
             SET updated_at = CURRENT_TIMESTAMP
             WHERE id = NEW.id;
         END
-        """)
+        """
         
-        db.execute(trigger_sql)
+        # 建表、索引和触发器拼成一个脚本，经底层DBAPI连接一次执行完
+        ddl_script = ";\n".join([create_table_sql, *indexes_sql, trigger_sql]) + ";"
+        db.connection().connection.executescript(ddl_script)
         
         db.commit()
         logger.info("任务执行记录表创建成功")
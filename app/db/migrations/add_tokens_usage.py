@@ -1,45 +1,50 @@
-import sqlite3
 import logging
 import json
 
-# 配置日志
-logging.basicConfig(level=logging.INFO)
+from app.db.migrations._common import (
+    existing_columns,
+    migration_txn,
+    pending_column_ddl,
+)
+
 logger = logging.getLogger(__name__)
 
+# 本迁移新增的列
+ADD_COLUMN_SQL = "ALTER TABLE news ADD COLUMN tokens_usage TEXT DEFAULT '{}'"
+
+
+def build_ddl(existing_cols):
+    """返回尚需执行的DDL（news表不存在或列已存在时为空列表），供迁移驱动合并成一个脚本执行"""
+    return pending_column_ddl(existing_cols, "news", "tokens_usage", ADD_COLUMN_SQL)
 
-def run_migration(db_path):
+
+def run_migration(db_path, conn=None, existing_cols=None):
     """向news表添加tokens_usage列，用于存储LLM调用消耗的tokens信息"""
     logger.info(f"开始执行迁移: 添加tokens_usage列到news表")
 
     try:
-        # 连接数据库
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # 检查列是否已存在
-        cursor.execute("PRAGMA table_info(news)")
-        columns = cursor.fetchall()
-        column_names = [column[1] for column in columns]
-
-        # 添加新列
-        if "tokens_usage" not in column_names:
-            logger.info("添加tokens_usage列到news表")
-            cursor.execute("ALTER TABLE news ADD COLUMN tokens_usage TEXT")
-
-            # 初始化所有现有记录的新列
-            cursor.execute("UPDATE news SET tokens_usage = '{}'")
-            conn.commit()
-            logger.info("成功添加tokens_usage列")
-        else:
-            logger.info("tokens_usage列已存在，无需添加")
-
-        # 关闭连接
-        conn.close()
-        return True
+        # 在单个事务中完成检查与修改（迁移驱动传入共享连接时直接复用）
+        with migration_txn(db_path, conn) as cursor:
+            # 检查列是否已存在
+            column_names = existing_columns(cursor, "news", existing_cols)
+
+            # 添加新列
+            if "tokens_usage" not in column_names:
+                logger.info("添加tokens_usage列到news表")
+                # 通过列默认值初始化现有记录，避免逐行 UPDATE 重写整张表
+                cursor.execute(ADD_COLUMN_SQL)
+                column_names.add("tokens_usage")
+                logger.info("成功添加tokens_usage列")
+            else:
+                logger.info("tokens_usage列已存在，无需添加")
+
+            return True
+
     except Exception as e:
         logger.error(f"执行迁移时出错: {str(e)}")
         return False
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     run_migration("daily_digest.db")
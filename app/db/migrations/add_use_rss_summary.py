@@ -1,13 +1,30 @@
 import sqlite3
 import logging
 from pathlib import Path
+from typing import Dict, Optional, Set
+
+from app.db.migrations._common import (
+    existing_columns,
+    migration_txn,
+    pending_column_ddl,
+)
 
-# 配置日志
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 本迁移新增的列
+ADD_COLUMN_SQL = "ALTER TABLE sources ADD COLUMN use_rss_summary BOOLEAN DEFAULT 1"
+
+
+def build_ddl(existing_cols):
+    """返回尚需执行的DDL（sources表不存在或列已存在时为空列表），供迁移驱动合并成一个脚本执行"""
+    return pending_column_ddl(existing_cols, "sources", "use_rss_summary", ADD_COLUMN_SQL)
+
 
-def run_migration(db_path: str):
+def run_migration(
+    db_path: str,
+    conn: Optional[sqlite3.Connection] = None,
+    existing_cols: Optional[Dict[str, Set[str]]] = None,
+):
     """为sources表添加use_rss_summary字段的迁移脚本"""
     logger.info("开始执行迁移: 添加use_rss_summary字段到sources表")
 
@@ -17,49 +34,32 @@ def run_migration(db_path: str):
         return False
 
     try:
-        # 连接数据库
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # 检查列是否已存在
-        cursor.execute("PRAGMA table_info(sources)")
-        columns = cursor.fetchall()
-        column_names = [column[1] for column in columns]
-
-        if "use_rss_summary" not in column_names:
-            logger.info("添加 use_rss_summary 列到 sources 表")
-
-            # 添加新列，默认值为True（参考RSS原始摘要）
-            cursor.execute(
-                "ALTER TABLE sources ADD COLUMN use_rss_summary BOOLEAN DEFAULT 1"
-            )
+        # 在单个事务中完成检查与修改（迁移驱动传入共享连接时直接复用）
+        with migration_txn(db_path, conn) as cursor:
+            # 检查列是否已存在
+            column_names = existing_columns(cursor, "sources", existing_cols)
 
-            # 为现有的RSS源设置默认值为True（保持现有行为）
-            cursor.execute("UPDATE sources SET use_rss_summary = 1 WHERE type = 'rss'")
+            if "use_rss_summary" not in column_names:
+                logger.info("添加 use_rss_summary 列到 sources 表")
 
-            # 为网页源设置默认值为True（虽然对网页源无效，但保持一致性）
-            cursor.execute(
-                "UPDATE sources SET use_rss_summary = 1 WHERE type = 'webpage'"
-            )
+                # 添加新列，默认值为True（参考RSS原始摘要）；
+                # 常量默认值会直接作用于已有的RSS源和网页源，无需再逐行 UPDATE
+                cursor.execute(ADD_COLUMN_SQL)
+                column_names.add("use_rss_summary")
 
-            conn.commit()
-            logger.info("use_rss_summary 字段添加成功，现有RSS源已设置为使用原始摘要")
-        else:
-            logger.info("use_rss_summary 字段已存在，跳过迁移")
+                logger.info("use_rss_summary 字段添加成功，现有RSS源已设置为使用原始摘要")
+            else:
+                logger.info("use_rss_summary 字段已存在，跳过迁移")
 
-        # 关闭连接
-        conn.close()
-        return True
+            return True
 
     except Exception as e:
         logger.error(f"执行迁移时出错: {str(e)}")
-        if "conn" in locals():
-            conn.rollback()
-            conn.close()
         return False
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     import os
 
     db_path = os.environ.get("DATABASE_URL", "daily_digest.db")
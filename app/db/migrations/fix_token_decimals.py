@@ -2,26 +2,23 @@
 修复tokens字段中的小数值，转换为整数
 """
 import logging
-from sqlalchemy import create_engine, MetaData, Table, text
+from sqlalchemy import text
 
-# 设置日志
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-metadata = MetaData()
+from app.db.migrations._common import get_engine
 
+logger = logging.getLogger(__name__)
 
 def migrate(connection):
-    # 获取sources表
-    sources = Table("sources", metadata, autoload_with=connection)
-    
-    # 使用更简单的方法直接更新所有记录
+    # 只更新存储类型不是整数的记录，已修复过的行不再重写
     query = text("""
         UPDATE sources 
         SET 
             prompt_tokens = CAST(prompt_tokens AS INTEGER),
             completion_tokens = CAST(completion_tokens AS INTEGER),
             tokens_used = CAST(tokens_used AS INTEGER)
+        WHERE typeof(prompt_tokens) NOT IN ('integer', 'null')
+           OR typeof(completion_tokens) NOT IN ('integer', 'null')
+           OR typeof(tokens_used) NOT IN ('integer', 'null')
     """)
     
     result = connection.execute(query)
@@ -45,9 +42,8 @@ def run_migration(db_path="daily_digest.db"):
     logger.info("开始执行token小数值修复...")
     
     try:
-        # 创建数据库连接
-        engine = create_engine(f"sqlite:///{db_path}")
-        with engine.connect() as connection:
+        # 复用共享引擎，整个迁移在一个事务中执行并在结束时提交
+        with get_engine(db_path).begin() as connection:
             # 执行迁移
             result = migrate(connection)
             return result
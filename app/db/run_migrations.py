@@ -3,12 +3,9 @@
 """
 
 import logging
-import os
-import importlib.util
+import inspect
 import sys
 
-# 配置日志
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 导入迁移模块
@@ -21,54 +18,89 @@ from app.db.migrations.fix_token_decimals import run_migration as fix_token_deci
 from app.db.migrations.add_sources_autoincrement import (
     run_migration as add_sources_autoincrement,
 )
+from app.db.migrations.add_detection_started_at import (
+    run_migration as add_detection_started_at,
+)
+from app.db.migrations.add_duplicate_detection_results import (
+    run_migration as add_duplicate_detection_results,
+)
+from app.db.migrations.add_duplicate_detection_status import (
+    run_migration as add_duplicate_detection_status,
+)
+from app.db.migrations.add_tokens_usage import run_migration as add_tokens_usage
+from app.db.migrations.add_use_newspaper import run_migration as add_use_newspaper
+from app.db.migrations.add_use_rss_summary import run_migration as add_use_rss_summary
+from app.db.migrations._common import (
+    applied_versions,
+    ensure_versions_table,
+    mark_applied,
+    open_connection,
+    snapshot_columns,
+)
+
+# 迁移注册表：(版本名, run_migration)，版本名即 schema_migrations 中记录的脚本名，
+# 按脚本文件名顺序执行。只登记接受 db_path 的迁移；add_duplicate_check_days_config
+# 固定使用应用的 SessionLocal，add_cron_config 等没有 run_migration 的脚本由 update_schema 执行
+MIGRATIONS = [
+    ("add_article_summary", add_article_summary),
+    ("add_detailed_tokens", add_detailed_tokens),
+    ("add_detection_started_at", add_detection_started_at),
+    ("add_duplicate_detection_results", add_duplicate_detection_results),
+    ("add_duplicate_detection_status", add_duplicate_detection_status),
+    ("add_newspaper_keywords", add_newspaper_keywords),
+    ("add_sources_autoincrement", add_sources_autoincrement),
+    ("add_summary_source", add_summary_source),
+    ("add_tokens_counter", add_tokens_counter),
+    ("add_tokens_usage", add_tokens_usage),
+    ("add_use_newspaper", add_use_newspaper),
+    ("add_use_rss_summary", add_use_rss_summary),
+    ("fix_token_decimals", fix_token_decimals),
+]
 
 def run_all_migrations(db_path="daily_digest.db"):
     """运行所有迁移脚本"""
     logger.info(f"开始运行所有迁移脚本，数据库路径: {db_path}")
+    logger.info(f"共登记 {len(MIGRATIONS)} 个迁移脚本")
     
-    # 迁移脚本目录
-    migrations_dir = os.path.join(os.path.dirname(__file__), "migrations")
-    
-    if not os.path.exists(migrations_dir):
-        logger.warning(f"迁移目录不存在: {migrations_dir}")
-        os.makedirs(migrations_dir)
-        logger.info(f"已创建迁移目录: {migrations_dir}")
-    
-    # 获取所有迁移脚本
-    migration_files = sorted([f for f in os.listdir(migrations_dir) 
-                             if f.endswith('.py') and not f.startswith('__')])
-    
-    if not migration_files:
-        logger.warning("没有找到迁移脚本")
-        return
-    
-    logger.info(f"找到 {len(migration_files)} 个迁移脚本")
+    # 执行每个迁移脚本，支持共享连接的迁移复用同一个连接
+    conn = open_connection(db_path)
+    try:
+        # 跳过 schema_migrations 中已记录完成的迁移
+        ensure_versions_table(conn)
+        applied = applied_versions(conn)
+        pending = [m for m in MIGRATIONS if m[0] not in applied]
+        if len(pending) < len(MIGRATIONS):
+            logger.info(f"跳过 {len(MIGRATIONS) - len(pending)} 个已完成的迁移")
+
+        existing_cols = snapshot_columns(conn, ("sources", "news", "digests"))
+        _run_migration_list(pending, db_path, conn, existing_cols)
+    finally:
+        conn.close()
     
-    # 执行每个迁移脚本
-    for migration_file in migration_files:
-        migration_path = os.path.join(migrations_dir, migration_file)
-        logger.info(f"执行迁移: {migration_file}")
+    logger.info("所有迁移脚本执行完毕")
+
+def _run_migration_list(migrations, db_path, conn, existing_cols):
+    """依次执行登记的迁移，按各迁移支持的参数传入共享连接和列名快照"""
+    for version, run in migrations:
+        logger.info(f"执行迁移: {version}")
         
         try:
-            # 动态加载迁移模块
-            spec = importlib.util.spec_from_file_location(
-                f"migration_{migration_file}", migration_path)
-            migration_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(migration_module)
-            
-            # 运行迁移
-            if hasattr(migration_module, 'run_migration'):
-                result = migration_module.run_migration(db_path)
-                if result:
-                    logger.info(f"迁移 {migration_file} 成功完成")
-                else:
-                    logger.warning(f"迁移 {migration_file} 不需要执行或已执行过")
+            params = inspect.signature(run).parameters
+            kwargs = {}
+            if 'conn' in params:
+                kwargs['conn'] = conn
+            if 'existing_cols' in params:
+                kwargs['existing_cols'] = existing_cols
+            result = run(db_path, **kwargs)
+            if result:
+                # 迁移已完成（本次执行或此前已存在）时返回True，记录后不再检查；
+                # 返回False表示出错或前置表缺失，下次仍会执行
+                mark_applied(conn, version)
+                logger.info(f"迁移 {version} 已完成")
             else:
-                logger.error(f"迁移 {migration_file} 没有run_migration函数")
+                logger.warning(f"迁移 {version} 未完成，下次启动时重试")
         except Exception as e:
-            logger.error(f"执行迁移 {migration_file} 失败: {str(e)}")
-    
-    logger.info("所有迁移脚本执行完毕")
+            logger.error(f"执行迁移 {version} 失败: {str(e)}")
 
 def run_migrations(db_path="daily_digest.db"):
     """
@@ -78,23 +110,31 @@ def run_migrations(db_path="daily_digest.db"):
     - db_path: 数据库文件路径
     
     返回:
-    - 布尔值，表示是否有任何迁移被执行
+    - 布尔值，表示是否有任何迁移已完成（本次执行或此前已存在）
     """
     
-    # 执行迁移并收集结果
+    # 执行迁移并收集结果，基于sqlite3的迁移共用同一个连接和同一份列名快照
     results = []
-    results.append(add_article_summary(db_path))
-    results.append(add_newspaper_keywords(db_path))
-    results.append(add_summary_source(db_path))
-    results.append(add_tokens_counter(db_path))
-    results.append(add_detailed_tokens(db_path))
-    results.append(fix_token_decimals(db_path))
-    results.append(add_sources_autoincrement(db_path))
+    conn = open_connection(db_path)
+    try:
+        existing_cols = snapshot_columns(conn, ("sources", "news"))
+        results.append(add_article_summary(db_path, conn, existing_cols))
+        results.append(add_newspaper_keywords(db_path, conn, existing_cols))
+        results.append(add_summary_source(db_path, conn, existing_cols))
+        results.append(add_tokens_counter(db_path))
+        results.append(add_detailed_tokens(db_path))
+        results.append(fix_token_decimals(db_path))
+        results.append(add_sources_autoincrement(db_path, conn))
+    finally:
+        conn.close()
     
     # 如果有任何一个迁移被执行，则返回True
     return any(results)
 
 if __name__ == "__main__":
+    # 仅在命令行直接运行时配置日志，被导入时沿用应用自己的日志配置
+    logging.basicConfig(level=logging.INFO)
+
     # 可以通过命令行参数指定数据库路径
     db_path = "daily_digest.db"
     if len(sys.argv) > 1:
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -17,11 +18,21 @@ engine = create_engine(
     pool_timeout=30,       # 获取连接的超时时间
     pool_recycle=3600,     # 连接回收时间（1小时）
     pool_pre_ping=True,    # 使用前测试连接有效性
+    query_cache_size=1200, # 编译后SQL缓存条目数，热点接口的查询不必重复编译
     echo=False             # 关闭SQL调试输出（生产环境）
 )
 
-# 创建会话工厂
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQLite 启用 WAL 日志模式，读写互不阻塞；该设置持久保存在数据库文件上，每个进程设置一次即可
+if engine.dialect.name == "sqlite":
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+
+# 创建会话工厂，缓存保证整个进程只有一个工厂实例
+@lru_cache(maxsize=1)
+def _make_sessionmaker():
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+SessionLocal = _make_sessionmaker()
 
 # 依赖项，用于获取数据库会话
 def get_db():
@@ -5,34 +5,50 @@ import json
 from pathlib import Path
 
 # 导入迁移脚本
-from app.db.migrations.add_newspaper_keywords import (
-    run_migration as run_add_newspaper_keywords,
+from app.db.migrations import (
+    add_article_summary,
+    add_max_fetch_days,
+    add_newspaper_keywords,
+    add_tokens_usage,
+    add_use_newspaper,
+    add_use_rss_summary,
 )
-from app.db.migrations.add_article_summary import (
-    run_migration as run_add_article_summary,
-)
-from app.db.migrations.add_tokens_usage import run_migration as run_add_tokens_usage
-from app.db.migrations.add_use_rss_summary import (
-    run_migration as run_add_use_rss_summary,
-)
-from app.db.migrations.add_use_newspaper import run_migration as run_add_use_newspaper
-from app.db.migrations.add_max_fetch_days import migrate_add_max_fetch_days
 from app.db.migrations.add_duplicate_detection_results import run_migration as run_add_duplicate_detection_results
 from app.db.migrations.add_cron_config import migration_add_cron_config
+from app.db.migrations._common import (
+    applied_versions,
+    ensure_versions_table,
+    existing_columns,
+    mark_applied,
+    migration_txn,
+    open_connection,
+    optimize_connection,
+    snapshot_columns,
+)
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def update_sources_table():
-    """更新sources表，添加抓取状态和结果字段"""
-    # 获取数据库文件路径
+def _get_db_path():
+    """从 DATABASE_URL 中取得SQLite数据库文件路径"""
     db_path = os.environ.get("DATABASE_URL", "daily_digest.db")
 
     # 如果数据库路径是SQLAlchemy URL，则提取文件路径
     if db_path.startswith("sqlite:///"):
         db_path = db_path[10:]
+    return db_path
+
+
+def update_sources_table(conn=None, existing_cols=None):
+    """更新sources表，添加抓取状态和结果字段
+
+    conn / existing_cols 为启动流程传入的共享连接和列名快照（可选），
+    传入连接时不会关闭，也不在此处执行 PRAGMA optimize
+    """
+    # 获取数据库文件路径
+    db_path = _get_db_path()
 
     # 确保数据库存在
     if not Path(db_path).exists():
@@ -42,41 +58,52 @@ def update_sources_table():
     logger.info(f"开始更新数据库: {db_path}")
 
     try:
-        # 连接数据库
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        # 连接数据库，与迁移使用相同的连接参数（WAL、NORMAL同步等）
+        own_conn = conn is None
+        if own_conn:
+            conn = open_connection(db_path)
+        try:
+            # 加列和初始化在同一个事务中完成，只提交一次
+            with migration_txn(db_path, conn) as cursor:
+                # 检查列是否已存在
+                column_names = existing_columns(cursor, "sources", existing_cols)
 
-        # 检查列是否已存在
-        cursor.execute("PRAGMA table_info(sources)")
-        columns = cursor.fetchall()
-        column_names = [column[1] for column in columns]
+                # 添加新列
+                changes_made = False
 
-        # 添加新列
-        changes_made = False
+                if "last_fetch_status" not in column_names:
+                    logger.info("添加 last_fetch_status 列")
+                    cursor.execute("ALTER TABLE sources ADD COLUMN last_fetch_status TEXT")
+                    column_names.add("last_fetch_status")
+                    changes_made = True
 
-        if "last_fetch_status" not in column_names:
-            logger.info("添加 last_fetch_status 列")
-            cursor.execute("ALTER TABLE sources ADD COLUMN last_fetch_status TEXT")
-            changes_made = True
+                if "last_fetch_result" not in column_names:
+                    logger.info("添加 last_fetch_result 列")
+                    cursor.execute("ALTER TABLE sources ADD COLUMN last_fetch_result TEXT")
+                    column_names.add("last_fetch_result")
+                    changes_made = True
 
-        if "last_fetch_result" not in column_names:
-            logger.info("添加 last_fetch_result 列")
-            cursor.execute("ALTER TABLE sources ADD COLUMN last_fetch_result TEXT")
-            changes_made = True
+                if changes_made:
+                    # 只初始化新列仍为空的记录，重复执行时不会重写已有的抓取状态
+                    cursor.execute(
+                        "UPDATE sources SET "
+                        "last_fetch_status = COALESCE(last_fetch_status, 'unknown'), "
+                        "last_fetch_result = COALESCE(last_fetch_result, '{}') "
+                        "WHERE last_fetch_status IS NULL OR last_fetch_result IS NULL"
+                    )
+
+            if own_conn:
+                # 更新查询规划器统计信息
+                optimize_connection(conn)
+        finally:
+            # 关闭连接
+            if own_conn:
+                conn.close()
 
-        # 如果进行了更改，提交事务
         if changes_made:
-            # 初始化所有现有记录的新列
-            cursor.execute(
-                "UPDATE sources SET last_fetch_status = 'unknown', last_fetch_result = '{}'"
-            )
-            conn.commit()
             logger.info("数据库更新成功")
         else:
             logger.info("数据库结构已是最新，无需更改")
-
-        # 关闭连接
-        conn.close()
         return True
 
     except Exception as e:
@@ -84,53 +111,180 @@ def update_sources_table():
         return False
 
 
-def run_migrations():
-    """执行所有数据库迁移脚本"""
+# 加列迁移注册表：(版本名, 生成DDL的函数, 表名, 列名)，按顺序执行；
+# 目标列已存在即视为完成，版本名与 run_migrations.py 记录的脚本名一致
+COLUMN_MIGRATIONS = [
+    ("add_newspaper_keywords", add_newspaper_keywords.build_ddl, "news", "newspaper_keywords"),
+    ("add_article_summary", add_article_summary.build_ddl, "news", "article_summary"),
+    ("add_tokens_usage", add_tokens_usage.build_ddl, "news", "tokens_usage"),
+    ("add_use_rss_summary", add_use_rss_summary.build_ddl, "sources", "use_rss_summary"),
+    ("add_use_newspaper", add_use_newspaper.build_ddl, "sources", "use_newspaper"),
+    ("add_max_fetch_days", add_max_fetch_days.build_ddl, "sources", "max_fetch_days"),
+]
+
+# 索引迁移注册表：(版本名, 表名, DDL)。create_all 不会给已存在的表补建索引，
+# 模型 __table_args__ 中新增的索引需在此登记，表存在时随启动补建
+INDEX_MIGRATIONS = [
+    (
+        "add_news_used_created_index",
+        "news",
+        "CREATE INDEX IF NOT EXISTS ix_news_used_created ON news (is_used_in_digest, created_at)",
+    ),
+    (
+        "add_news_source_processed_index",
+        "news",
+        "CREATE INDEX IF NOT EXISTS ix_news_source_processed ON news (source_id, is_processed)",
+    ),
+    (
+        "add_task_exec_type_status_updated_index",
+        "task_executions",
+        "CREATE INDEX IF NOT EXISTS ix_task_exec_type_status_updated "
+        "ON task_executions (task_type, status, updated_at)",
+    ),
+]
+
+
+def run_migrations(conn=None, existing_cols=None):
+    """执行所有数据库迁移脚本
+
+    conn / existing_cols 为启动流程传入的共享连接和列名快照（可选），
+    传入连接时不会关闭，也不在此处执行 PRAGMA optimize
+    """
     logger.info("开始执行数据库迁移...")
 
     # 获取数据库文件路径
-    db_path = os.environ.get("DATABASE_URL", "daily_digest.db")
-
-    # 如果数据库路径是SQLAlchemy URL，则提取文件路径
-    if db_path.startswith("sqlite:///"):
-        db_path = db_path[10:]
+    db_path = _get_db_path()
 
     # 确保数据库存在
     if not Path(db_path).exists():
         logger.error(f"数据库文件不存在: {db_path}")
         return False
 
-    # 执行所有迁移脚本
+    # 执行所有迁移脚本，基于sqlite3的迁移共用同一个连接和同一份列名快照
+    own_conn = conn is None
+    if own_conn:
+        conn = open_connection(db_path)
     try:
-        # 添加newspaper_keywords字段
-        run_add_newspaper_keywords(db_path)
+        # schema_migrations 中已记录的迁移直接跳过，全部完成时只需一次查询
+        ensure_versions_table(conn)
+        applied = applied_versions(conn)
 
-        # 添加article_summary字段
-        run_add_article_summary(db_path)
+        pending = [m for m in COLUMN_MIGRATIONS if m[0] not in applied]
+        if pending:
+            if existing_cols is None:
+                existing_cols = snapshot_columns(conn, ("sources", "news"))
 
-        # 添加tokens_usage字段
-        run_add_tokens_usage(db_path)
+            # 收集各迁移尚需执行的DDL，拼成一个脚本在同一个事务中一次执行
+            statements = []
+            added = []
+            for version, build_ddl, table, column in pending:
+                ddl = build_ddl(existing_cols)
+                if ddl:
+                    logger.info(f"迁移 {version}: 添加 {table}.{column} 列")
+                    statements.extend(ddl)
+                    added.append((table, column))
+            if statements:
+                try:
+                    conn.executescript("BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;")
+                except sqlite3.Error:
+                    # 脚本中途失败时事务仍处于打开状态，整体回滚
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+                for table, column in added:
+                    existing_cols[table].add(column)
 
-        # 添加use_rss_summary字段
-        run_add_use_rss_summary(db_path)
+            for version, build_ddl, table, column in pending:
+                if column in existing_cols[table]:
+                    mark_applied(conn, version)
 
-        # 添加use_newspaper字段
-        run_add_use_newspaper(db_path)
-
-        # 添加max_fetch_days字段
-        migrate_add_max_fetch_days(db_path)
+        # 补建索引，表尚不存在的留待下次启动
+        pending_indexes = [m for m in INDEX_MIGRATIONS if m[0] not in applied]
+        if pending_indexes:
+            if existing_cols is None:
+                existing_cols = {}
+            missing_tables = {m[1] for m in pending_indexes} - existing_cols.keys()
+            existing_cols.update(snapshot_columns(conn, missing_tables))
+            for version, table, ddl in pending_indexes:
+                if existing_cols.get(table):
+                    logger.info(f"迁移 {version}: 为 {table} 表创建索引")
+                    conn.execute(ddl)
+                    mark_applied(conn, version)
 
         # 添加重复检测结果表
-        run_add_duplicate_detection_results(db_path)
+        if "add_duplicate_detection_results" not in applied:
+            run_add_duplicate_detection_results(db_path, conn)
+            mark_applied(conn, "add_duplicate_detection_results")
 
         # 添加cron配置表
-        migration_add_cron_config()
+        if "add_cron_config" not in applied:
+            migration_add_cron_config()
+            mark_applied(conn, "add_cron_config")
+
+        if own_conn:
+            # 迁移改变了表结构，更新查询规划器统计信息
+            optimize_connection(conn)
 
         logger.info("所有迁移脚本执行完成")
         return True
     except Exception as e:
         logger.error(f"执行迁移脚本时出错: {str(e)}")
         return False
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def run_startup_schema_tasks():
+    """应用启动时的数据库检查与迁移
+
+    共用一个连接依次完成：快速完整性检查、一次性读取各表列名、
+    sources表更新、迁移脚本，最后执行一次 PRAGMA optimize
+    """
+    db_path = _get_db_path()
+    if not Path(db_path).exists():
+        logger.error(f"数据库文件不存在: {db_path}")
+        return False
+
+    conn = open_connection(db_path)
+    try:
+        # quick_check 跳过索引与表内容的交叉校验，比 integrity_check 快得多
+        problems = [row[0] for row in conn.execute("PRAGMA quick_check")]
+        if problems != ["ok"]:
+            logger.error(f"数据库完整性检查发现问题: {problems[:10]}")
+
+        existing_cols = snapshot_columns(
+            conn, ("sources", "news", "digests", "cron_configs")
+        )
+        sources_ok = update_sources_table(conn, existing_cols)
+        migrations_ok = run_migrations(conn, existing_cols)
+
+        optimize_connection(conn)
+        return sources_ok and migrations_ok
+    finally:
+        conn.close()
+
+
+def get_migration_version():
+    """返回最近一次完成的迁移版本名，数据库或 schema_migrations 表不存在时返回None
+
+    应用启动完成迁移后由 lifespan 调用一次，结果缓存在 app.state.schema_version
+    """
+    db_path = _get_db_path()
+    if not Path(db_path).exists():
+        return None
+
+    conn = open_connection(db_path)
+    try:
+        row = conn.execute(
+            "SELECT version FROM schema_migrations "
+            "ORDER BY applied_at DESC, rowid DESC LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
 import os
-import urllib.parse
+import re
+from urllib.parse import unquote
 from contextlib import asynccontextmanager
+from datetime import datetime
+import pytz
 from fastapi import FastAPI, Request, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 try:
     from starlette.middleware.proxy_headers import ProxyHeadersMiddleware  # type: ignore
     _HAS_PROXY_HEADERS = True
@@ -29,99 +31,79 @@ setup_logging(
 )
 logger = get_logger(__name__)
 
+# 代理编码路径的前缀和其中主机、API路径的匹配规则，均针对未解码的 raw_path
+_PROXY_PATH_PREFIXES = (b"//", b"/http:", b"/https:", b"/http%3", b"/https%3")
+_PROXY_PATH_RE = re.compile(r'^/(?:https?(?::|%3[aA])/)?/([^/]+)(/api/.+)$')
+# 允许改写的代理目标主机（host:port，逗号分隔），其他主机的路径原样交给路由
+_PROXY_REWRITE_HOSTS = frozenset(
+    host.strip().lower()
+    for host in os.getenv("PROXY_REWRITE_HOSTS", "185.194.141.108:18899").split(",")
+    if host.strip()
+)
 
-# URL解码中间件，处理代理导致的URL编码问题
-class URLDecodeMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # 获取原始路径
-        original_path = str(request.url.path)
-        original_query = str(request.url.query)
-        
-        # 记录所有请求路径用于调试
-        logger.info(f"中间件收到请求路径: {original_path}")
-        
-        # 检查是否是被代理编码后部分解码的路径
-        # 格式: //185.194.141.108:18899/api/digest/16/pdf
-        if original_path.startswith("//") and "185.194.141.108:18899" in original_path:
-            try:
-                logger.info(f"检测到代理编码路径: {original_path}")
-                
-                # 查找API路径的开始位置
-                api_start = original_path.find("/api/")
-                if api_start != -1:
-                    # 提取真正的API路径
-                    real_path = original_path[api_start:]
-                    logger.info(f"提取的API路径: {real_path}")
-                    
-                    # 检查是否是PDF下载请求
-                    if "/pdf" in real_path and request.method in ["GET", "HEAD"]:
-                        import re
-                        pdf_match = re.search(r'/api/digest/(\d+)/pdf$', real_path)
-                        if pdf_match:
-                            digest_id = int(pdf_match.group(1))
-                            logger.info(f"直接处理PDF下载请求，digest_id: {digest_id}")
-                            
-                                                        # 导入必要的依赖并直接调用处理函数
-                            from app.db.session import get_db
-                            from app.api.endpoints.digest import download_digest_pdf
-                            
-                            # 创建数据库会话
-                            db = next(get_db())
-                            try:
-                                return download_digest_pdf(digest_id, request, db)
-                            finally:
-                                db.close()
-                    
-                    # 检查是否是快报详情请求
-                    elif real_path.startswith("/api/digest/") and request.method == "GET":
-                        import re
-                        digest_match = re.search(r'/api/digest/(\d+)$', real_path)
-                        if digest_match:
-                            digest_id = int(digest_match.group(1))
-                            logger.info(f"直接处理快报详情请求，digest_id: {digest_id}")
-                            
-                            # 导入必要的依赖并直接调用处理函数
-                            from app.db.session import get_db
-                            from app.api.endpoints.digest import get_digest
-                            from fastapi.responses import JSONResponse
-                            
-                            # 创建数据库会话
-                            db = next(get_db())
-                            try:
-                                # 调用处理函数并转换为JSONResponse
-                                result = get_digest(digest_id, db)
-                                return JSONResponse(content=result)
-                            except Exception as e:
-                                logger.error(f"处理快报详情请求失败: {e}")
-                                # 继续正常流程
-                            finally:
-                                db.close()
+# 北京时区，健康检查等处复用，避免每次请求重新查找时区
+_BEIJING_TZ = pytz.timezone('Asia/Shanghai')
+
+
+# 代理路径改写中间件，处理代理导致的URL编码问题
+class ProxyPathRewriteMiddleware:
+    """纯ASGI中间件：把被代理编码的路径改写为真实的API路径后交给路由处理
+
+    代理可能把完整URL当作路径转发，常见两种形式：
+    //185.194.141.108:18899/api/digest/16/pdf 和 /http%3A//185.194.141.108:18899/api/digest/16
+    普通请求只做一次前缀判断，不构造 Request 对象。
+    匹配基于未解码的 raw_path，改写后的 path 只解码一次，raw_path 保持编码形式
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            raw_path = scope.get("raw_path") or scope["path"].encode("utf-8")
+            if raw_path.startswith(_PROXY_PATH_PREFIXES):
+                raw_text = raw_path.decode("latin-1")
+                match = _PROXY_PATH_RE.match(raw_text)
+                if not match:
+                    logger.warning("无法在路径中找到API路径: %s", raw_text)
+                elif unquote(match.group(1)).lower() not in _PROXY_REWRITE_HOSTS:
+                    logger.warning("代理路径的目标主机不在允许列表中: %s", raw_text)
                 else:
-                    logger.warning(f"无法在路径中找到API路径: {original_path}")
-                    
-            except Exception as e:
-                logger.error(f"URL处理失败: {e}")
-        
-        response = await call_next(request)
-        return response
-
-# 初始化NLTK资源
-import app.services
+                    raw_api_path = match.group(2)
+                    api_path = unquote(raw_api_path)
+                    logger.debug("代理编码路径 %s 改写为 %s", raw_text, api_path)
+                    scope = dict(
+                        scope,
+                        path=api_path,
+                        raw_path=raw_api_path.encode("latin-1"),
+                    )
+        await self.app(scope, receive, send)
 
 from app.api.router import api_router
 from app.db.session import engine, SessionLocal
 from app.db.base import Base
 from app.db.init_db import init_db
-from app.db.update_schema import update_sources_table, run_migrations
+from app.db.update_schema import run_startup_schema_tasks, get_migration_version
+from app.db.migrations._common import optimize_connection
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 启动时执行
+    # 初始化NLTK资源；放在这里而不是模块导入时，只有真正启动服务才会检查和下载
+    from app.services import init_nltk_resources
+    try:
+        init_nltk_resources()
+    except Exception as e:
+        logger.error(f"初始化NLTK资源时出错: {str(e)}")
+        # 即使NLTK资源初始化失败，也不要阻止应用启动
+
     Base.metadata.create_all(bind=engine)
     init_db()
-    update_sources_table()
-    run_migrations()
+    # 数据库检查、加列和迁移共用一个连接，结束时统一更新统计信息
+    run_startup_schema_tasks()
+    # 迁移版本只在启动后变化，读取一次供 /health 直接返回，避免每次探活都查库
+    app.state.schema_version = get_migration_version()
 
     # ✨ APScheduler已禁用 - 使用系统Cron进行任务调度
     # 注释原因：决定使用传统的系统cron，更稳定可靠
@@ -149,13 +131,25 @@ async def lifespan(app: FastAPI):
     # APScheduler已禁用，无需关闭
     # 系统Cron由容器管理，应用关闭时不影响cron服务
 
+    # 退出前按运行期间的查询情况更新SQLite统计信息，再释放连接池
+    if engine.dialect.name == "sqlite":
+        try:
+            conn = engine.raw_connection()
+            try:
+                optimize_connection(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"执行PRAGMA optimize失败: {e}")
+    engine.dispose()
+
 
 # 创建应用
 app = FastAPI(title="每日安全快报系统", lifespan=lifespan)
 
 # 配置中间件
-# 首先添加URL解码中间件（需要最先处理）
-app.add_middleware(URLDecodeMiddleware)
+# 首先添加代理路径改写中间件（需要最先处理）
+app.add_middleware(ProxyPathRewriteMiddleware)
 
 # 使应用在反向代理后正确识别原始协议/客户端IP（依赖 X-Forwarded-* 头）
 if _HAS_PROXY_HEADERS:
@@ -175,6 +169,30 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 # 设置模板
 templates = Jinja2Templates(directory="app/templates")
 
+# 非调试模式下模板不会再修改：关闭自动重载，并缓存只依赖 request 的页面渲染结果。
+# 模板中的 url_for 生成带主机名的绝对地址，因此按 (模板, 站点根地址) 缓存
+_CACHE_PAGES = os.getenv("DEBUG", "False").lower() != "true"
+_PAGE_CACHE_MAX = 64
+_page_cache = {}
+if _CACHE_PAGES:
+    templates.env.auto_reload = False
+
+
+def _render_page(name: str, request: Request):
+    """渲染除 request 外没有其他上下文的页面"""
+    if not _CACHE_PAGES:
+        return templates.TemplateResponse(name, {"request": request})
+
+    key = (name, str(request.base_url))
+    html = _page_cache.get(key)
+    if html is None:
+        # 主机名来自请求头，限制缓存条目数，避免被任意Host头撑大
+        if len(_page_cache) >= _PAGE_CACHE_MAX:
+            _page_cache.clear()
+        html = templates.get_template(name).render({"request": request})
+        _page_cache[key] = html
+    return HTMLResponse(html)
+
 # 初始化路由
 app.include_router(api_router)
 
@@ -183,130 +201,59 @@ app.include_router(api_router)
 @app.get("/health")
 async def health_check():
     """健康检查端点，用于容器和负载均衡器检查服务状态"""
-    from datetime import datetime
-    import pytz
-    
     # 使用北京时间并包含时区信息
-    beijing_tz = pytz.timezone('Asia/Shanghai')
-    now = datetime.now()
-    if now.tzinfo is None:
-        now = beijing_tz.localize(now)
-    else:
-        now = now.astimezone(beijing_tz)
+    now = datetime.now(_BEIJING_TZ)
     
     return {
         "status": "healthy",
         "timestamp": now.isoformat(),
-        "service": "Daily Digest System"
+        "service": "Daily Digest System",
+        "schema_version": getattr(app.state, "schema_version", None)
     }
 
 
 # 前端首页路由
 @app.get("/")
 async def index(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return _render_page("index.html", request)
 
 
 # 新闻页面路由
 @app.get("/news")
 async def news_page(request: Request):
-    return templates.TemplateResponse("news.html", {"request": request})
+    return _render_page("news.html", request)
 
 
 # 快报页面路由
 @app.get("/digest")
 async def digest_page(request: Request):
-    return templates.TemplateResponse("digest.html", {"request": request})
+    return _render_page("digest.html", request)
 
 
 # 快报详情页面路由
 @app.get("/digest/{digest_id}")
 async def digest_detail_page(request: Request, digest_id: int):
-    return templates.TemplateResponse("digest.html", {"request": request})
+    return _render_page("digest.html", request)
 
 
 # 日志管理页面路由
 @app.get("/logs", response_class=HTMLResponse)
 async def logs_page(request: Request):
     """日志管理页面"""
-    return templates.TemplateResponse("logs.html", {"request": request})
+    return _render_page("logs.html", request)
 
 
 # 业务日志页面路由
 @app.get("/logs/business", response_class=HTMLResponse)
 async def business_logs_page(request: Request):
     """业务日志中心页面（爬取、LLM处理、快报生成）"""
-    return templates.TemplateResponse("logs_business.html", {"request": request})
+    return _render_page("logs_business.html", request)
 
 
 # 管理页面路由
 @app.get("/admin")
 async def admin(request: Request):
-    return templates.TemplateResponse("admin.html", {"request": request})
-
-
-# 专门处理代理编码URL的路由
-@app.get("/http%3A//{rest_of_path:path}")
-@app.head("/http%3A//{rest_of_path:path}")
-@app.get("http%3A//{rest_of_path:path}")
-@app.head("http%3A//{rest_of_path:path}")
-async def handle_proxy_encoded_url(rest_of_path: str, request: Request):
-    """处理被代理服务器编码的URL"""
-    import urllib.parse
-    import re
-    
-    try:
-        # 重建完整的编码URL
-        full_encoded_url = f"http%3A//{rest_of_path}"
-        logger.info(f"检测到代理编码的URL: {full_encoded_url}")
-        
-        # 解码URL
-        decoded_url = urllib.parse.unquote(full_encoded_url)
-        logger.info(f"解码后的URL: {decoded_url}")
-        
-        # 提取API路径
-        # 预期格式: http://185.194.141.108:18899/api/digest/16 或 http://185.194.141.108:18899/api/digest/16/pdf
-        api_match = re.search(r'http://[^/]+(/api/.+)$', decoded_url)
-        if api_match:
-            api_path = api_match.group(1)
-            logger.info(f"提取的API路径: {api_path}")
-            
-            # 重定向到正确的API路径
-            from fastapi.responses import RedirectResponse
-            redirect_url = api_path
-            
-            # 保持HTTP方法
-            if request.method == "HEAD":
-                # 对于HEAD请求，我们需要直接调用相应的处理函数
-                # 检查是否是PDF下载请求
-                pdf_match = re.search(r'/api/digest/(\d+)/pdf$', api_path)
-                if pdf_match:
-                    digest_id = int(pdf_match.group(1))
-                    # 导入必要的依赖
-                    from app.db.session import get_db
-                    from app.api.endpoints.digest import download_digest_pdf
-                    
-                    # 创建数据库会话
-                    db = next(get_db())
-                    try:
-                        return download_digest_pdf(digest_id, request, db)
-                    finally:
-                        db.close()
-            
-            logger.info(f"重定向到: {redirect_url}")
-            return RedirectResponse(url=redirect_url, status_code=307)  # 307保持HTTP方法
-        else:
-            logger.warning(f"无法从解码URL中提取API路径: {decoded_url}")
-            
-    except Exception as e:
-        logger.error(f"处理代理编码URL失败: {e}")
-    
-    # 如果处理失败，返回404
-    from fastapi import HTTPException
-    raise HTTPException(status_code=404, detail="资源不存在")
-
-
-
+    return _render_page("admin.html", request)
 
 
 if __name__ == "__main__":
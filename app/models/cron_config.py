@@ -1,12 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index
+from sqlalchemy.orm import load_only
 from datetime import datetime
+from operator import attrgetter
 
 from app.db.base import Base
 
+# to_dict 一次取出全部字段
+_TO_DICT_GETTER = attrgetter(
+    "id", "task_name", "cron_expression", "enabled", "description", "created_at", "updated_at"
+)
+
 
 class CronConfig(Base):
     """Cron调度配置模型"""
     __tablename__ = "cron_configs"
+    __table_args__ = (
+        # 按启用状态筛选并取任务名时可直接走索引
+        Index("ix_cron_enabled_name", "enabled", "task_name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_name = Column(String(100), unique=True, nullable=False, index=True)
@@ -21,20 +32,30 @@ class CronConfig(Base):
 
     def to_dict(self):
         """转换为字典格式"""
+        id_, task_name, cron_expression, enabled, description, created_at, updated_at = (
+            _TO_DICT_GETTER(self)
+        )
         return {
-            'id': self.id,
-            'task_name': self.task_name,
-            'cron_expression': self.cron_expression,
-            'enabled': self.enabled,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'id': id_,
+            'task_name': task_name,
+            'cron_expression': cron_expression,
+            'enabled': enabled,
+            'description': description,
+            'created_at': created_at.isoformat() if created_at else None,
+            'updated_at': updated_at.isoformat() if updated_at else None
         }
 
     @classmethod
     def get_enabled_configs(cls, db):
         """获取所有启用的配置"""
-        return db.query(cls).filter(cls.enabled == True).all()
+        # 生成crontab/注册任务只用到这几列，不加载时间戳；
+        # description 在会话关闭后仍会被读取，必须一并加载
+        return (
+            db.query(cls)
+            .options(load_only(cls.task_name, cls.cron_expression, cls.enabled, cls.description))
+            .filter(cls.enabled == True)
+            .all()
+        )
 
     @classmethod
     def get_config_by_name(cls, db, task_name: str):
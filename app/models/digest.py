@@ -21,7 +21,7 @@ class Digest(Base):
     pdf_path = Column(String(500), nullable=True)
     
     # 关联的新闻
-    news_items = relationship("News", secondary=digest_news, backref="digests")
+    news_items = relationship("News", secondary=digest_news, back_populates="digests")
 
     # 重复检测结果
     duplicate_detection_results = relationship("DuplicateDetectionResult", back_populates="digest")
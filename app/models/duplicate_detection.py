@@ -35,4 +35,12 @@ class DuplicateDetectionResult(Base):
     # 关联关系
     digest = relationship("Digest", back_populates="duplicate_detection_results")
     news = relationship("News", foreign_keys=[news_id], back_populates="duplicate_detection_results")
-    duplicate_with_news = relationship("News", foreign_keys=[duplicate_with_news_id])
\ No newline at end of file
+    duplicate_with_news = relationship("News", foreign_keys=[duplicate_with_news_id])
+
+    @classmethod
+    def bulk_create(cls, db, rows):
+        """批量插入检测记录（rows 为字段字典列表），一次提交代替逐行 add+commit"""
+        if not rows:
+            return
+        db.bulk_insert_mappings(cls, rows)
+        db.commit()
@@ -8,10 +8,11 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Enum,
+    Index,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, JSONType
 import enum
 
 
@@ -25,6 +26,12 @@ class NewsCategory(enum.Enum):
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        # 近期未入快报新闻（按创建时间范围筛选并排序）
+        Index("ix_news_used_created", "is_used_in_digest", "created_at"),
+        # 按来源查找待AI处理的新闻
+        Index("ix_news_source_processed", "source_id", "is_processed"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     source_id = Column(Integer, ForeignKey("sources.id"))
@@ -42,8 +49,8 @@ class News(Base):
         String(50), nullable=True
     )  # 摘要来源：'original'(原文摘要)或'generated'(AI生成)
     category = Column(Enum(NewsCategory), nullable=True)  # 分类
-    entities = Column(JSON, nullable=True)  # 提取的实体
-    newspaper_keywords = Column(JSON, nullable=True)  # Newspaper4k提取的关键词
+    entities = Column(JSONType, nullable=True)  # 提取的实体
+    newspaper_keywords = Column(JSONType, nullable=True)  # Newspaper4k提取的关键词
     tokens_usage = Column(JSON, nullable=True)  # API消耗的tokens信息
 
     # 后续处理标志
@@ -59,5 +66,14 @@ class News(Base):
     # 关联
     source = relationship("Source")
 
+    # 所属快报：只允许显式预加载（如 selectinload(News.digests)），
+    # 遍历新闻时误触发逐条懒加载会直接报错，而不是悄悄产生N+1查询
+    digests = relationship(
+        "Digest",
+        secondary="digest_news",
+        back_populates="news_items",
+        lazy="raise_on_sql",
+    )
+
     # 重复检测结果
     duplicate_detection_results = relationship("DuplicateDetectionResult", foreign_keys="DuplicateDetectionResult.news_id", back_populates="news")
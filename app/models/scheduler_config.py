@@ -1,9 +1,19 @@
 from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+import threading
+import time
 
 from app.db.base import Base
 
+# get_value 的进程内缓存：{config_key: (过期时间, config_value 或 _MISSING)}
+# 配置很少变化，调度器每次运行却要读取多项配置；set_value 会立即失效对应条目
+_CACHE_TTL = 30  # 秒
+_CACHE_MAX = 256
+_MISSING = object()
+_value_cache = {}
+_cache_lock = threading.Lock()
+
 
 class SchedulerConfig(Base):
     """调度器配置模型"""
@@ -23,24 +33,36 @@ class SchedulerConfig(Base):
 
     @classmethod
     def get_value(cls, db, key: str, default_value=None, value_type: str = "string"):
-        """获取配置值"""
-        config = db.query(cls).filter(
-            cls.config_key == key,
-            cls.is_active == True
-        ).first()
-        
-        if not config:
+        """获取配置值（带 _CACHE_TTL 秒的进程内缓存）"""
+        now = time.monotonic()
+        with _cache_lock:
+            cached = _value_cache.get(key)
+        if cached is not None and cached[0] > now:
+            raw_value = cached[1]
+        else:
+            row = db.query(cls.config_value).filter(
+                cls.config_key == key,
+                cls.is_active == True
+            ).first()
+            # 不存在的配置也缓存，避免反复查询
+            raw_value = row[0] if row else _MISSING
+            with _cache_lock:
+                if len(_value_cache) >= _CACHE_MAX:
+                    _value_cache.clear()
+                _value_cache[key] = (now + _CACHE_TTL, raw_value)
+
+        if raw_value is _MISSING:
             return default_value
             
         try:
             if value_type == "float":
-                return float(config.config_value)
+                return float(raw_value)
             elif value_type == "int":
-                return int(config.config_value)
+                return int(raw_value)
             elif value_type == "bool":
-                return config.config_value.lower() in ('true', '1', 'yes', 'on')
+                return raw_value.lower() in ('true', '1', 'yes', 'on')
             else:
-                return config.config_value
+                return raw_value
         except (ValueError, AttributeError):
             return default_value
 
@@ -67,4 +89,6 @@ class SchedulerConfig(Base):
             db.add(config)
         
         db.commit()
+        with _cache_lock:
+            _value_cache.pop(key, None)
         return config 
\ No newline at end of file
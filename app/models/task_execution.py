@@ -1,21 +1,47 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index, exists, insert, literal, or_, select
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+from operator import attrgetter
+import time
 from typing import Dict, Any, Optional
 
-from app.db.base import Base
+from app.db.base import Base, JSONType
+
+# to_dict 输出的字段（按输出顺序），一次取出全部字段
+_TO_DICT_FIELDS = (
+    'id', 'task_type', 'task_id', 'status', 'message', 'details',
+    'start_time', 'end_time', 'duration_seconds',
+    'progress_current', 'progress_total', 'progress_percentage',
+    'items_processed', 'items_success', 'items_failed',
+    'hostname', 'process_id',
+    'error_type', 'error_message',
+    'created_at', 'updated_at',
+)
+_TO_DICT_GETTER = attrgetter(*_TO_DICT_FIELDS)
+# 需要转换为ISO字符串的时间字段
+_DATETIME_FIELDS = ('start_time', 'end_time', 'created_at', 'updated_at')
+
+# 进度落盘节奏：进度每推进约 1/_PROGRESS_COMMIT_STEPS 提交一次，且距上次提交
+# 超过 _PROGRESS_COMMIT_INTERVAL 秒必定提交，保证 updated_at 持续刷新
+# （acquire_lock 以 updated_at 判断任务是否存活）
+_PROGRESS_COMMIT_STEPS = 20
+_PROGRESS_COMMIT_INTERVAL = 5  # 秒
 
 
 class TaskExecution(Base):
     """任务执行记录模型"""
     __tablename__ = "task_executions"
+    __table_args__ = (
+        # acquire_lock 按类型查找仍在运行且未超时的任务
+        Index("ix_task_exec_type_status_updated", "task_type", "status", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_type = Column(String(100), nullable=False, index=True)  # 任务类型: crawl_sources, event_generation, cache_cleanup
     task_id = Column(String(200), nullable=True, index=True)  # 任务ID，用于标识同一批次的任务
     status = Column(String(50), nullable=False, index=True)  # 执行状态: running, success, error, warning, info
     message = Column(Text, nullable=True)  # 执行消息
-    details = Column(JSON, nullable=True)  # 详细信息，存储为JSON格式
+    details = Column(JSONType, nullable=True)  # 详细信息，存储为JSON格式
     
     # 时间记录
     start_time = Column(DateTime, nullable=False, index=True)
@@ -49,29 +75,12 @@ class TaskExecution(Base):
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
-        return {
-            'id': self.id,
-            'task_type': self.task_type,
-            'task_id': self.task_id,
-            'status': self.status,
-            'message': self.message,
-            'details': self.details,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
-            'duration_seconds': self.duration_seconds,
-            'progress_current': self.progress_current,
-            'progress_total': self.progress_total,
-            'progress_percentage': self.progress_percentage,
-            'items_processed': self.items_processed,
-            'items_success': self.items_success,
-            'items_failed': self.items_failed,
-            'hostname': self.hostname,
-            'process_id': self.process_id,
-            'error_type': self.error_type,
-            'error_message': self.error_message,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        result = dict(zip(_TO_DICT_FIELDS, _TO_DICT_GETTER(self)))
+        for key in _DATETIME_FIELDS:
+            value = result[key]
+            if value is not None:
+                result[key] = value.isoformat()
+        return result
 
     @classmethod
     def create_task_start(cls, db, task_type: str, task_id: str = None, 
@@ -96,8 +105,26 @@ class TaskExecution(Base):
         db.refresh(execution)
         return execution
 
+    @staticmethod
+    def should_commit_progress(current: int, total: int,
+                               last_commit_at: Optional[float] = None) -> bool:
+        """进度是否需要落盘
+
+        last_commit_at 为上次提交时的 time.monotonic()，None 表示尚未提交过。
+        首次、最后一次、每推进约 1/20 以及距上次提交超过5秒时提交
+        """
+        if last_commit_at is None or current >= total:
+            return True
+        if current % max(1, total // _PROGRESS_COMMIT_STEPS) == 0:
+            return True
+        return time.monotonic() - last_commit_at >= _PROGRESS_COMMIT_INTERVAL
+
     def update_progress(self, db, current: int, total: int, message: str = None):
-        """更新任务进度"""
+        """更新任务进度
+
+        每次调用都会提交；需要节流的调用方先用 should_commit_progress 判断，
+        跳过的进度点不应调用本方法（只 flush 会一直占着 SQLite 写锁）
+        """
         self.progress_current = current
         self.progress_total = total
         self.progress_percentage = int((current / total) * 100) if total > 0 else 0
@@ -185,37 +212,76 @@ class TaskExecution(Base):
         尝试获取任务锁（数据库锁机制）
         如果已有同类型任务在运行，返回None
         否则创建新的运行记录并返回
+
+        检查与插入合并为一条 INSERT ... SELECT ... WHERE NOT EXISTS，
+        多个调度进程同时获取锁时只有一个能插入成功
         """
-        # 检查是否有同类型任务正在运行
-        running_task = db.query(cls).filter(
+        import socket
+        import os
+        from datetime import timedelta
+
+        now = datetime.now()
+        # 超过2小时未更新的运行中任务视为僵尸任务，不再占用锁
+        timeout_threshold = now - timedelta(hours=2)
+        values = {
+            'task_type': task_type,
+            'task_id': f"{task_type}_{now.strftime('%Y%m%d_%H%M%S')}",
+            'status': 'running',
+            'message': message or f"开始执行任务: {task_type}",
+            'details': details or {},
+            'start_time': now,
+            'hostname': socket.gethostname(),
+            'process_id': os.getpid(),
+            'created_at': now,
+            'updated_at': now,
+        }
+        columns = cls.__table__.c
+        # updated_at 为空的运行中任务无法判断是否超时，与以前一样视为仍在运行
+        running = exists().where(
             cls.task_type == task_type,
-            cls.status == 'running'
-        ).first()
-        
-        if running_task:
-            # 已有任务在运行，检查是否是僵尸任务（超过2小时未更新）
-            from datetime import timedelta
-            timeout_threshold = datetime.now() - timedelta(hours=2)
-            
-            if running_task.updated_at and running_task.updated_at < timeout_threshold:
-                # 僵尸任务，强制完成
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"检测到僵尸任务 {running_task.id}，强制完成")
-                
-                running_task.status = 'error'
-                running_task.end_time = datetime.now()
-                running_task.error_message = "任务超时，被后续任务强制终止"
-                running_task.error_type = "task_timeout"
-                if running_task.start_time:
-                    running_task.duration_seconds = int((running_task.end_time - running_task.start_time).total_seconds())
-                db.commit()
-            else:
-                # 正常运行中的任务，返回None表示获取锁失败
-                return None
-        
-        # 创建新任务记录
-        return cls.create_task_start(db, task_type, message=message, details=details)
+            cls.status == 'running',
+            or_(cls.updated_at.is_(None), cls.updated_at >= timeout_threshold)
+        )
+        row_source = select(
+            *[literal(value, columns[key].type) for key, value in values.items()]
+        ).where(~running)
+        new_id = db.execute(
+            insert(cls).from_select(list(values), row_source).returning(cls.id)
+        ).scalar()
+
+        if new_id is None:
+            # 正常运行中的任务，返回None表示获取锁失败
+            db.rollback()
+            return None
+
+        # 僵尸任务，强制完成
+        zombie_count = db.query(cls).filter(
+            cls.task_type == task_type,
+            cls.status == 'running',
+            cls.updated_at < timeout_threshold
+        ).update({
+            cls.status: 'error',
+            cls.end_time: now,
+            cls.error_message: "任务超时，被后续任务强制终止",
+            cls.error_type: "task_timeout",
+            cls.updated_at: now,
+        }, synchronize_session=False)
+        if zombie_count:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning(f"检测到 {zombie_count} 个 {task_type} 僵尸任务，已强制完成")
+            # 僵尸任务很少出现，逐行补上执行时长
+            zombies = db.query(cls).filter(
+                cls.task_type == task_type,
+                cls.error_type == "task_timeout",
+                cls.end_time == now,
+                cls.start_time.isnot(None)
+            )
+            for zombie in zombies:
+                zombie.duration_seconds = int((now - zombie.start_time).total_seconds())
+
+        db.commit()
+        return db.get(cls, new_id)
 
     @classmethod
     def release_lock(cls, db, execution_id: int, status: str = 'success', 
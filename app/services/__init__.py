@@ -1,5 +1,4 @@
 import logging
-import nltk
 
 # 获取日志记录器
 from app.config import get_logger
@@ -8,7 +7,10 @@ logger = get_logger(__name__)
 
 # 初始化NLTK资源
 def init_nltk_resources():
-    """初始化和检查必要的NLTK资源"""
+    """初始化和检查必要的NLTK资源（由应用启动流程调用）"""
+    # nltk 导入较慢，只在真正初始化时加载，导入 app.services 的子模块不受影响
+    import nltk
+
     nltk_resources = [
         "punkt",  # 用于标记化
         "punkt_tab",  # 标记化相关
@@ -33,11 +35,3 @@ def init_nltk_resources():
                 logger.info(f"NLTK资源 {resource} 下载完成")
             except Exception as e:
                 logger.warning(f"下载NLTK资源 {resource} 失败: {str(e)}")
-
-
-# 应用启动时初始化NLTK资源
-try:
-    init_nltk_resources()
-except Exception as e:
-    logger.error(f"初始化NLTK资源时出错: {str(e)}")
-    # 即使NLTK资源初始化失败，也不要阻止应用启动
@@ -44,7 +44,8 @@ def create_digest_content(news_items):
     # 生成Markdown内容
     today = datetime.now().strftime('%Y%m%d')
     
-    md_content = f"# **每日网安情报速递【{today}】**\n\n------\n\n"
+    # 逐段收集后一次性拼接，避免反复拷贝不断变长的字符串
+    md_parts = [f"# **每日网安情报速递【{today}】**\n\n------\n\n"]
     
     # 按特定顺序处理分类
     category_order = [
@@ -56,7 +57,7 @@ def create_digest_content(news_items):
     
     for category in category_order:
         category_name = get_category_name(category, category_order.index(category) + 1)
-        md_content += f"### {category_name}\n\n"
+        md_parts.append(f"### {category_name}\n\n")
         
         # 检查是否有该分类的新闻
         if category in categorized_news and categorized_news[category]:
@@ -74,19 +75,19 @@ def create_digest_content(news_items):
                 if not summary:
                     summary = "暂无摘要"
                 
-                md_content += f"{i}. **{title}**\n"
-                md_content += f"    - {summary}\n"
+                md_parts.append(f"{i}. **{title}**\n")
+                md_parts.append(f"    - {summary}\n")
                 if i < len(news_in_category):  # 不是最后一条新闻时添加空行
-                    md_content += "\n"
+                    md_parts.append("\n")
         else:
             # 没有该分类的新闻时显示"暂无"
-            md_content += "> 暂无\n"
+            md_parts.append("> 暂无\n")
         
-        md_content += "\n------\n\n"
+        md_parts.append("\n------\n\n")
     
     # 处理"其他"分类（只有在有新闻条目时才显示）
     if NewsCategory.OTHER in categorized_news and categorized_news[NewsCategory.OTHER]:
-        md_content += f"### 五、其他\n\n"
+        md_parts.append(f"### 五、其他\n\n")
         
         other_news = categorized_news[NewsCategory.OTHER]
         for i, news in enumerate(other_news, 1):
@@ -101,14 +102,14 @@ def create_digest_content(news_items):
             if not summary:
                 summary = "暂无摘要"
             
-            md_content += f"{i}. **{title}**\n"
-            md_content += f"    - {summary}\n"
+            md_parts.append(f"{i}. **{title}**\n")
+            md_parts.append(f"    - {summary}\n")
             if i < len(other_news):  # 不是最后一条新闻时添加空行
-                md_content += "\n"
+                md_parts.append("\n")
         
-        md_content += "\n------\n\n"
+        md_parts.append("\n------\n\n")
     
-    return md_content
+    return "".join(md_parts)
 
 def generate_pdf(digest):
     """生成PDF文件"""
@@ -445,25 +445,37 @@ class DuplicateDetectorService:
                     logger.info("没有找到参考新闻，跳过重复检测")
                     return
 
-                # 为每条选中的新闻创建检测记录
-                for news_id in selected_news_ids:
+                # 一次查出选中的新闻，并为存在的新闻批量创建检测记录
+                news_by_id = {
+                    news.id: news
+                    for news in db.query(News).filter(News.id.in_(selected_news_ids)).all()
+                }
+                DuplicateDetectionResult.bulk_create(db, [
+                    {
+                        "digest_id": digest_id,
+                        "news_id": news_id,
+                        "status": DuplicateDetectionStatus.CHECKING.value,
+                    }
+                    for news_id in dict.fromkeys(selected_news_ids)
+                    if news_id in news_by_id
+                ])
+                results_by_news_id = {
+                    result.news_id: result
+                    for result in db.query(DuplicateDetectionResult).filter(
+                        DuplicateDetectionResult.digest_id == digest_id,
+                        DuplicateDetectionResult.news_id.in_(list(news_by_id)),
+                        DuplicateDetectionResult.status == DuplicateDetectionStatus.CHECKING.value
+                    ).order_by(DuplicateDetectionResult.id).all()
+                }
+
+                for news_id in dict.fromkeys(selected_news_ids):
                     try:
-                        # 获取当前新闻
-                        current_news = db.query(News).filter(News.id == news_id).first()
-                        if not current_news:
+                        current_news = news_by_id.get(news_id)
+                        detection_result = results_by_news_id.get(news_id)
+                        if not current_news or not detection_result:
                             logger.warning(f"新闻 {news_id} 不存在")
                             continue
 
-                        # 创建检测记录
-                        detection_result = DuplicateDetectionResult(
-                            digest_id=digest_id,
-                            news_id=news_id,
-                            status=DuplicateDetectionStatus.CHECKING.value
-                        )
-                        db.add(detection_result)
-                        db.commit()
-                        db.refresh(detection_result)
-
                         logger.info(f"开始检测新闻 {news_id}: {current_news.title[:50]}...")
 
                         # 与参考新闻进行比较
@@ -1,7 +1,7 @@
 
 import logging
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 
 from app.models.news import News
@@ -31,8 +31,10 @@ class NewsDuplicateDetector:
         
         start_date = datetime.now() - timedelta(days=days)
         
-        # 查找在指定日期之后创建的快报
-        recent_digests = self.db.query(Digest).filter(Digest.created_at >= start_date).all()
+        # 查找在指定日期之后创建的快报，关联新闻用一次IN查询批量加载，避免逐个快报懒加载
+        recent_digests = self.db.query(Digest).options(
+            selectinload(Digest.news_items)
+        ).filter(Digest.created_at >= start_date).all()
         
         historical_news_ids = set()
         for digest in recent_digests:
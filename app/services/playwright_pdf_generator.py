@@ -1,4 +1,5 @@
 import os
+import re
 import logging
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
@@ -17,6 +18,9 @@ logger = get_logger(__name__)
 # 加载模板引擎
 template_env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
 
+# 列表子项（"- " 前有缩进）的行首空白，不跨行
+_SUB_ITEM_INDENT_RE = re.compile(r"^[^\S\n]+(?=- )", re.M)
+
 class PlaywrightPDFGenerator:
     """基于Playwright的PDF生成器"""
     
@@ -248,25 +252,10 @@ class PlaywrightPDFGenerator:
     
     def _normalize_markdown_indentation(self, md_content):
         """规范化Markdown缩进，确保列表结构正确"""
-        import re
-        
-        lines = md_content.split('\n')
-        normalized_lines = []
-        
-        for line in lines:
-            # 检查是否是列表项的子项（以"- "开头，前面有空格）
-            if re.match(r'^\s+- ', line):
-                # 统一使用4个空格缩进
-                content = line.lstrip()  # 移除所有前导空格
-                normalized_line = '    ' + content  # 添加4个空格
-                normalized_lines.append(normalized_line)
-                logger.debug(f"规范化缩进: '{line.rstrip()}' -> '{normalized_line}'")
-            else:
-                # 其他行保持不变
-                normalized_lines.append(line)
-        
-        result = '\n'.join(normalized_lines)
-        logger.debug(f"Markdown缩进规范化完成，处理了 {len(lines)} 行")
+        # 列表项的子项统一使用4个空格缩进，其他行保持不变；
+        # 一次替换代替逐行拆分、匹配再拼接
+        result, count = _SUB_ITEM_INDENT_RE.subn('    ', md_content)
+        logger.debug(f"Markdown缩进规范化完成，调整了 {count} 行")
         return result
 
 # 创建全局实例 - 默认使用原有渲染器保证兼容性
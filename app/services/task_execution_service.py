@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
@@ -16,6 +17,8 @@ class TaskExecutionService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # {任务执行记录ID: 上次提交进度时的 time.monotonic()}
+        self._progress_committed_at = {}
     
     def create_task_start(self, task_type: str, task_id: str = None, 
                          message: str = None, details: Dict = None) -> Optional[TaskExecution]:
@@ -33,7 +36,16 @@ class TaskExecutionService:
     
     def update_task_progress(self, task_execution_id: int, current: int, 
                            total: int, message: str = None) -> bool:
-        """更新任务进度"""
+        """更新任务进度
+
+        按 TaskExecution.should_commit_progress 的节奏节流：跳过的进度点
+        不查询也不更新数据库；节流时间戳只记录在本服务中
+        """
+        if not TaskExecution.should_commit_progress(
+            current, total, self._progress_committed_at.get(task_execution_id)
+        ):
+            return True
+
         db = SessionLocal()
         try:
             task_execution = db.query(TaskExecution).filter(
@@ -45,6 +57,10 @@ class TaskExecutionService:
                 return False
             
             task_execution.update_progress(db, current, total, message)
+            if current >= total:
+                self._progress_committed_at.pop(task_execution_id, None)
+            else:
+                self._progress_committed_at[task_execution_id] = time.monotonic()
             return True
             
         except Exception as e:
@@ -58,6 +74,7 @@ class TaskExecutionService:
                      items_processed: int = None, items_success: int = None, 
                      items_failed: int = None) -> bool:
         """完成任务"""
+        self._progress_committed_at.pop(task_execution_id, None)
         db = SessionLocal()
         try:
             task_execution = db.query(TaskExecution).filter(
@@ -84,6 +101,7 @@ class TaskExecutionService:
                  error_type: str = None, stack_trace: str = None, 
                  details: Dict = None) -> bool:
         """标记任务失败"""
+        self._progress_committed_at.pop(task_execution_id, None)
         db = SessionLocal()
         try:
             task_execution = db.query(TaskExecution).filter(